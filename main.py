@@ -9,13 +9,21 @@ import ctypes
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
 
-from src.gui.main_window import MainWindow
+# Resolve o ponteiro da função uma única vez (cada acesso via
+# ctypes.windll refaz LoadLibrary/GetProcAddress)
+if sys.platform == "win32":
+    _IsUserAnAdmin = ctypes.windll.shell32.IsUserAnAdmin
+    _IsUserAnAdmin.restype = ctypes.c_int
+else:
+    _IsUserAnAdmin = None
 
 
 def is_admin() -> bool:
     """Verifica se está rodando como administrador."""
+    if _IsUserAnAdmin is None:
+        return False
     try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
+        return bool(_IsUserAnAdmin())
     except Exception:
         return False
 
@@ -48,7 +56,18 @@ def main():
     
     # Evita fechar quando a janela fecha (para bandeja)
     app.setQuitOnLastWindowClosed(False)
-    
+
+    # Import tardio: só depois do QApplication existir, para o event
+    # loop ficar disponível antes de carregar todo o grafo de módulos
+    # (keyboard, pynput, core) que a janela principal arrasta
+    from src.gui.styles import DARK_THEME
+    from src.gui.main_window import MainWindow
+
+    # Tema no QApplication, antes de existir qualquer widget: o Qt
+    # parseia as regras uma vez e aplica sob demanda, em vez de
+    # recalcular o estilo da árvore inteira a cada widget criado
+    app.setStyleSheet(DARK_THEME)
+
     window = MainWindow()
     window.show()
     
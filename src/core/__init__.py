@@ -1,6 +1,20 @@
 # Core module
-from .macro import Macro, MacroAction
-from .recorder import MacroRecorder
-from .player import MacroPlayer
-from .hotkey_manager import HotkeyManager
-from .storage import MacroStorage
+# Imports tardios (PEP 562): importar src.core não arrasta keyboard,
+# pynput etc. até o primeiro uso de cada classe.
+_EXPORTS = {
+    "Macro": ".macro",
+    "MacroAction": ".macro",
+    "MacroRecorder": ".recorder",
+    "MacroPlayer": ".player",
+    "HotkeyManager": ".hotkey_manager",
+    "MacroStorage": ".storage",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
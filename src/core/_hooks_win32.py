@@ -0,0 +1,260 @@
+"""
+Hook de baixo nível único (Windows) para a captura da gravação.
+
+Os dois listeners do pynput (teclado + mouse) criam uma thread cada,
+com uma ponte C -> Python e aquisição do GIL por evento. Aqui um único
+WH_KEYBOARD_LL + WH_MOUSE_LL roda em uma thread só com message loop
+próprio: o callback C apenas empilha tuplas cruas em uma SimpleQueue e
+uma thread de drenagem converte e repassa para o gravador. O timestamp
+vem do próprio evento do SO (campo `time`, em ms), com deltas mais
+precisos que time.time() chamado no callback.
+
+Disponível apenas no Windows; em outras plataformas is_available()
+retorna False e o gravador usa o pynput.
+"""
+import sys
+import threading
+from queue import SimpleQueue
+from typing import Callable, Optional
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _user32 = ctypes.windll.user32
+    _kernel32 = ctypes.windll.kernel32
+
+    _WH_KEYBOARD_LL = 13
+    _WH_MOUSE_LL = 14
+
+    _WM_KEYDOWN = 0x0100
+    _WM_KEYUP = 0x0101
+    _WM_SYSKEYDOWN = 0x0104
+    _WM_SYSKEYUP = 0x0105
+
+    _WM_MOUSEMOVE = 0x0200
+    _WM_LBUTTONDOWN = 0x0201
+    _WM_LBUTTONUP = 0x0202
+    _WM_RBUTTONDOWN = 0x0204
+    _WM_RBUTTONUP = 0x0205
+    _WM_MBUTTONDOWN = 0x0207
+    _WM_MBUTTONUP = 0x0208
+    _WM_MOUSEWHEEL = 0x020A
+    _WM_MOUSEHWHEEL = 0x020E
+
+    _WM_QUIT = 0x0012
+
+    _ULONG_PTR = ctypes.c_size_t
+    _LRESULT = ctypes.c_ssize_t
+
+    class _KBDLLHOOKSTRUCT(ctypes.Structure):
+        _fields_ = [("vkCode", wintypes.DWORD),
+                    ("scanCode", wintypes.DWORD),
+                    ("flags", wintypes.DWORD),
+                    ("time", wintypes.DWORD),
+                    ("dwExtraInfo", _ULONG_PTR)]
+
+    class _MSLLHOOKSTRUCT(ctypes.Structure):
+        _fields_ = [("pt", wintypes.POINT),
+                    ("mouseData", wintypes.DWORD),
+                    ("flags", wintypes.DWORD),
+                    ("time", wintypes.DWORD),
+                    ("dwExtraInfo", _ULONG_PTR)]
+
+    _HOOKPROC = ctypes.WINFUNCTYPE(_LRESULT, ctypes.c_int,
+                                   wintypes.WPARAM, wintypes.LPARAM)
+
+    # Teclas especiais por virtual-key, com os mesmos nomes que o
+    # pynput produz (o player converte de volta com getattr(Key, nome))
+    _VK_NAMES = {
+        0x08: "backspace", 0x09: "tab", 0x0D: "enter", 0x13: "pause",
+        0x14: "caps_lock", 0x1B: "esc", 0x20: "space",
+        0x21: "page_up", 0x22: "page_down", 0x23: "end", 0x24: "home",
+        0x25: "left", 0x26: "up", 0x27: "right", 0x28: "down",
+        0x2C: "print_screen", 0x2D: "insert", 0x2E: "delete",
+        0x5B: "cmd", 0x5C: "cmd_r", 0x5D: "menu",
+        0x90: "num_lock", 0x91: "scroll_lock",
+        0x10: "shift", 0xA0: "shift", 0xA1: "shift_r",
+        0x11: "ctrl_l", 0xA2: "ctrl_l", 0xA3: "ctrl_r",
+        0x12: "alt_l", 0xA4: "alt_l", 0xA5: "alt_gr",
+    }
+    _VK_NAMES.update({0x70 + i: f"f{i + 1}" for i in range(12)})
+
+    _MAPVK_VK_TO_CHAR = 2
+
+    # Botão e estado (pressionado) por mensagem de clique
+    _BUTTON_MSGS = {
+        _WM_LBUTTONDOWN: ("left", True), _WM_LBUTTONUP: ("left", False),
+        _WM_RBUTTONDOWN: ("right", True), _WM_RBUTTONUP: ("right", False),
+        _WM_MBUTTONDOWN: ("middle", True), _WM_MBUTTONUP: ("middle", False),
+    }
+
+    def is_available() -> bool:
+        """Indica se o hook nativo pode ser usado."""
+        return True
+
+else:
+    def is_available() -> bool:
+        """Indica se o hook nativo pode ser usado."""
+        return False
+
+
+def _vk_to_str(vk: int) -> str:
+    """Converte um virtual-key em string no formato do pynput."""
+    name = _VK_NAMES.get(vk)
+    if name is not None:
+        return name
+    ch = _user32.MapVirtualKeyW(vk, _MAPVK_VK_TO_CHAR) & 0xFFFF
+    if ch:
+        return chr(ch).lower()
+    return f"<{vk}>"
+
+
+class LowLevelHookListener:
+    """
+    Captura teclado e mouse com um único par de hooks LL do Windows.
+
+    Eventos chegam ao chamador via callbacks já convertidos, sempre com
+    o timestamp do SO em ms como último argumento:
+
+        on_key(key_str, pressed, time_ms)
+        on_click(x, y, button_str, pressed, time_ms)
+        on_scroll(x, y, dx, dy, time_ms)
+        on_move(x, y, time_ms)
+
+    Os callbacks rodam na thread de drenagem, nunca no callback C do
+    hook — o hook só enfileira, para devolver o controle ao SO o mais
+    rápido possível.
+    """
+
+    def __init__(self,
+                 on_key: Optional[Callable] = None,
+                 on_click: Optional[Callable] = None,
+                 on_scroll: Optional[Callable] = None,
+                 on_move: Optional[Callable] = None):
+        self.on_key = on_key
+        self.on_click = on_click
+        self.on_scroll = on_scroll
+        self.on_move = on_move
+
+        self._events: SimpleQueue = SimpleQueue()
+        self._hook_thread: Optional[threading.Thread] = None
+        self._drain_thread: Optional[threading.Thread] = None
+        self._hook_thread_id: Optional[int] = None
+        self._running = False
+
+    def start(self) -> None:
+        """Instala os hooks e inicia as threads de captura."""
+        if self._running or not is_available():
+            return
+        self._running = True
+
+        self._drain_thread = threading.Thread(
+            target=self._drain_loop, daemon=True,
+            name="HookDrain"
+        )
+        self._drain_thread.start()
+
+        self._hook_thread = threading.Thread(
+            target=self._hook_loop, daemon=True,
+            name="HookMessageLoop"
+        )
+        self._hook_thread.start()
+
+    def stop(self) -> None:
+        """Remove os hooks e encerra as threads."""
+        if not self._running:
+            return
+        self._running = False
+
+        if self._hook_thread_id is not None:
+            _user32.PostThreadMessageW(self._hook_thread_id,
+                                       _WM_QUIT, 0, 0)
+        if self._hook_thread is not None:
+            self._hook_thread.join(timeout=1)
+            self._hook_thread = None
+        self._hook_thread_id = None
+
+        # Sentinela acorda a drenagem para ela notar _running == False
+        self._events.put(None)
+        if self._drain_thread is not None:
+            self._drain_thread.join(timeout=1)
+            self._drain_thread = None
+
+    # --- Thread do hook (callback C + message loop) ------------------
+
+    def _hook_loop(self) -> None:
+        self._hook_thread_id = _kernel32.GetCurrentThreadId()
+        events = self._events
+
+        @_HOOKPROC
+        def _kbd_proc(n_code, w_param, l_param):
+            if n_code >= 0:
+                kbd = ctypes.cast(l_param,
+                                  ctypes.POINTER(_KBDLLHOOKSTRUCT)).contents
+                events.put(("k", w_param, kbd.vkCode, kbd.time))
+            return _user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        @_HOOKPROC
+        def _mouse_proc(n_code, w_param, l_param):
+            if n_code >= 0:
+                ms = ctypes.cast(l_param,
+                                 ctypes.POINTER(_MSLLHOOKSTRUCT)).contents
+                events.put(("m", w_param, ms.pt.x, ms.pt.y,
+                            ms.mouseData, ms.time))
+            return _user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        h_mod = _kernel32.GetModuleHandleW(None)
+        kbd_hook = _user32.SetWindowsHookExW(_WH_KEYBOARD_LL,
+                                             _kbd_proc, h_mod, 0)
+        mouse_hook = _user32.SetWindowsHookExW(_WH_MOUSE_LL,
+                                               _mouse_proc, h_mod, 0)
+
+        try:
+            msg = wintypes.MSG()
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                pass  # Hooks LL não entregam mensagens; só o WM_QUIT sai
+        finally:
+            if kbd_hook:
+                _user32.UnhookWindowsHookEx(kbd_hook)
+            if mouse_hook:
+                _user32.UnhookWindowsHookEx(mouse_hook)
+
+    # --- Thread de drenagem (conversão + callbacks) ------------------
+
+    def _drain_loop(self) -> None:
+        while True:
+            event = self._events.get()
+            if event is None:
+                if not self._running:
+                    return
+                continue
+            try:
+                self._dispatch(event)
+            except Exception as e:
+                print(f"Erro ao processar evento do hook: {e}")
+
+    def _dispatch(self, event: tuple) -> None:
+        if event[0] == "k":
+            _, msg, vk, time_ms = event
+            if self.on_key is not None:
+                pressed = msg in (_WM_KEYDOWN, _WM_SYSKEYDOWN)
+                self.on_key(_vk_to_str(vk), pressed, time_ms)
+            return
+
+        _, msg, x, y, mouse_data, time_ms = event
+        if msg == _WM_MOUSEMOVE:
+            if self.on_move is not None:
+                self.on_move(x, y, time_ms)
+        elif msg in _BUTTON_MSGS:
+            if self.on_click is not None:
+                button, pressed = _BUTTON_MSGS[msg]
+                self.on_click(x, y, button, pressed, time_ms)
+        elif msg in (_WM_MOUSEWHEEL, _WM_MOUSEHWHEEL):
+            if self.on_scroll is not None:
+                # High word de mouseData: delta em múltiplos de 120
+                delta = ctypes.c_short(mouse_data >> 16).value // 120
+                if msg == _WM_MOUSEWHEEL:
+                    self.on_scroll(x, y, 0, delta, time_ms)
+                else:
+                    self.on_scroll(x, y, delta, 0, time_ms)
@@ -0,0 +1,100 @@
+"""
+Kernels compilados (Numba) para a geração de pontos do movimento suave.
+
+Dependência opcional: quando numba/numpy não estão instalados, as
+funções daqui retornam None e o player usa o caminho puro-Python. Os
+kernels são compilados com cache=True para reaproveitar o binário entre
+execuções, e sem assinaturas explícitas para não pagar a compilação no
+import.
+"""
+import threading
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+
+# IDs inteiros das curvas (o dispatch dentro de código nopython precisa
+# de inteiros, não de membros de Enum)
+LINEAR = 0
+EASE_IN_QUAD = 1
+EASE_OUT_QUAD = 2
+EASE_IN_OUT_QUAD = 3
+EASE_OUT_CUBIC = 4
+EASE_OUT_EXPO = 5
+
+
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _gen_points(sx, sy, ex, ey, n, easing_id):
+        xs = np.empty(n + 1, np.int32)
+        ys = np.empty(n + 1, np.int32)
+        span_x = ex - sx
+        span_y = ey - sy
+        for i in range(n + 1):
+            t = i / n
+            if easing_id == 1:
+                e = t * t
+            elif easing_id == 2:
+                e = 1.0 - (1.0 - t) * (1.0 - t)
+            elif easing_id == 3:
+                if t < 0.5:
+                    e = 2.0 * t * t
+                else:
+                    e = 1.0 - ((-2.0 * t + 2.0) ** 2) / 2.0
+            elif easing_id == 4:
+                e = 1.0 - (1.0 - t) ** 3
+            elif easing_id == 5:
+                e = 1.0 if t == 1.0 else 1.0 - 2.0 ** (-10.0 * t)
+            else:
+                e = t
+            xs[i] = int(sx + span_x * e)
+            ys[i] = int(sy + span_y * e)
+        return xs, ys
+
+else:
+    _gen_points = None
+
+
+def is_available() -> bool:
+    """Indica se os kernels JIT podem ser usados."""
+    return _gen_points is not None
+
+
+def generate_points(start_x: int, start_y: int, end_x: int, end_y: int,
+                    total_steps: int, easing_id: int):
+    """
+    Gera as coordenadas do movimento via kernel JIT.
+
+    Returns:
+        Tupla (xs, ys) de listas de int, ou None se numba indisponível
+    """
+    if _gen_points is None:
+        return None
+    xs, ys = _gen_points(start_x, start_y, end_x, end_y,
+                         total_steps, easing_id)
+    return xs.tolist(), ys.tolist()
+
+
+def warmup_async() -> None:
+    """
+    Dispara a compilação do kernel em background.
+
+    A primeira chamada de uma função @njit paga o custo de compilação
+    (ou do load do cache); fazer isso no startup esconde essa latência
+    do primeiro movimento suave real.
+    """
+    if _gen_points is None:
+        return
+
+    def _warm():
+        try:
+            _gen_points(0, 0, 1, 1, 2, EASE_OUT_CUBIC)
+        except Exception:
+            pass
+
+    threading.Thread(target=_warm, daemon=True).start()
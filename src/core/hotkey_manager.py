@@ -1,10 +1,68 @@
 """
 Gerenciador de hotkeys globais.
 """
+import sys
+import time
+import queue
 import keyboard
+import itertools
 import threading
 from typing import Callable, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+
+# Virtual-key codes (Windows) das teclas de pânico mais comuns
+_VK_CODES = {
+    "escape": 0x1B,
+    "esc": 0x1B,
+    "pause": 0x13,
+    "space": 0x20,
+    "backspace": 0x08,
+    "tab": 0x09,
+    "enter": 0x0D,
+    "return": 0x0D,
+    "insert": 0x2D,
+    "delete": 0x2E,
+    "home": 0x24,
+    "end": 0x23,
+    "scroll_lock": 0x91,
+    "print_screen": 0x2C,
+}
+_VK_CODES.update({f"f{n}": 0x70 + n - 1 for n in range(1, 13)})
+
+
+# SetThreadPriority(GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL)
+_THREAD_PRIORITY_TIME_CRITICAL = 15
+
+
+def _boost_thread_priority() -> None:
+    """
+    Eleva a prioridade da thread atual (somente Windows).
+
+    As threads de dispatch e de pânico disputam CPU com a GUI e com o
+    jogo em primeiro plano; sem prioridade elevada a resposta da hotkey
+    degrada exatamente quando o sistema está carregado.
+    """
+    if sys.platform != "win32":
+        return
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(),
+                                   _THREAD_PRIORITY_TIME_CRITICAL)
+    except Exception:
+        pass
+
+
+def _resolve_vk(key: str) -> Optional[int]:
+    """Resolve uma tecla para o virtual-key code do Windows."""
+    key_lower = key.lower()
+    if key_lower in _VK_CODES:
+        return _VK_CODES[key_lower]
+    # Letras e dígitos: VK coincide com o código ASCII maiúsculo
+    if len(key_lower) == 1 and key_lower.isalnum():
+        return ord(key_lower.upper())
+    return None
 
 
 @dataclass
@@ -14,203 +72,370 @@ class HotkeyBinding:
     callback: Callable
     description: str = ""
     active: bool = True
+    # Combinações de scancodes que disparam esta binding (pré-compiladas)
+    combos: tuple = field(default=(), repr=False)
 
 
 class HotkeyManager:
-    """Gerencia hotkeys globais usando a biblioteca keyboard."""
-    
+    """
+    Gerencia hotkeys globais usando a biblioteca keyboard.
+
+    Em vez de registrar cada hotkey individualmente (o que faz o hook de
+    baixo nível percorrer uma lista de combos a cada tecla), instala um
+    único keyboard.hook e resolve a combinação pressionada com uma única
+    consulta a um dict indexado por frozenset de scancodes.
+    """
+
     def __init__(self):
         self._bindings: dict[str, HotkeyBinding] = {}
         self._active = False
         self._panic_key: Optional[str] = "escape"
         self._on_panic: Optional[Callable[[], None]] = None
-        
+
+        # Tabela de dispatch: frozenset de scancodes -> binding
+        self._combo_table: dict[frozenset, HotkeyBinding] = {}
+        self._down: set[int] = set()
+        self._hook = None
+
+        # Polling direto da tecla de pânico (somente Windows)
+        self._panic_vk: Optional[int] = None
+        self._panic_thread: Optional[threading.Thread] = None
+
+        # Fila de callbacks consumida por um worker dedicado, para que o
+        # hook de teclado retorne imediatamente
+        self._events: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+
+        # Modo batch: acumula binds para registrar tudo de uma vez
+        self._batch_mode = False
+        self._pending: list[tuple[str, str, Callable, str]] = []
+
         # Lock para thread safety
         self._lock = threading.Lock()
-    
+
     @property
     def is_active(self) -> bool:
         return self._active
-    
+
     @property
     def panic_key(self) -> Optional[str]:
         return self._panic_key
-    
+
     @panic_key.setter
     def panic_key(self, value: Optional[str]) -> None:
         """Define a tecla de pânico (para todas as macros)."""
-        # Remove binding anterior
-        if self._panic_key and f"__panic_{self._panic_key}" in self._bindings:
-            self.unbind(f"__panic_{self._panic_key}")
-        
         self._panic_key = value
-        
-        # Registra novo binding se estiver ativo
-        if self._active and value and self._on_panic:
-            self.bind(
-                f"__panic_{value}",
-                value,
-                self._on_panic,
-                "Parar todas as macros"
-            )
-    
+        self._register_panic()
+
     def set_panic_callback(self, callback: Callable[[], None]) -> None:
         """Define o callback para a tecla de pânico."""
         self._on_panic = callback
-        
-        # Registra se já estiver ativo
-        if self._active and self._panic_key:
+        self._register_panic()
+
+    def _register_panic(self) -> None:
+        """
+        Ativa a tecla de pânico (ponto único de registro).
+
+        Remove qualquer binding de pânico anterior antes de registrar,
+        para que trocar a tecla e trocar o callback em qualquer ordem
+        resulte em exatamente um registro ativo.
+
+        No Windows ela é monitorada por polling direto de GetAsyncKeyState
+        (~1 kHz), fora da fila do hook de teclado, para resposta imediata
+        mesmo com uma macro inundando a fila de input. Em outras
+        plataformas cai no caminho normal de binding.
+        """
+        # Remove bindings de pânico anteriores (qualquer tecla)
+        with self._lock:
+            for id in [b for b in self._bindings if b.startswith("__panic_")]:
+                self._unbind_internal(id)
+
+        if not (self._active and self._panic_key and self._on_panic):
+            self._panic_vk = None
+            return
+
+        vk = _resolve_vk(self._panic_key) if sys.platform == "win32" else None
+        self._panic_vk = vk
+
+        if vk is not None:
+            if self._panic_thread is None or not self._panic_thread.is_alive():
+                self._panic_thread = threading.Thread(
+                    target=self._panic_poll_loop, daemon=True
+                )
+                self._panic_thread.start()
+        else:
             self.bind(
                 f"__panic_{self._panic_key}",
                 self._panic_key,
-                callback,
+                self._on_panic,
                 "Parar todas as macros"
             )
-    
-    def bind(self, id: str, hotkey: str, callback: Callable, 
+
+    def _panic_poll_loop(self) -> None:
+        """Loop de polling da tecla de pânico (GetAsyncKeyState)."""
+        import ctypes
+        _boost_thread_priority()
+        get_async_key_state = ctypes.windll.user32.GetAsyncKeyState
+
+        was_down = False
+        while self._active:
+            vk = self._panic_vk
+            if vk is not None:
+                is_down = bool(get_async_key_state(vk) & 0x8000)
+                if is_down and not was_down and self._on_panic:
+                    try:
+                        self._on_panic()
+                    except Exception as e:
+                        print(f"Erro no callback de pânico: {e}")
+                was_down = is_down
+            time.sleep(0.001)
+
+    @staticmethod
+    def _compile_hotkey(hotkey: str) -> tuple:
+        """
+        Compila uma string de hotkey em combinações de scancodes.
+
+        Cada tecla pode mapear para mais de um scancode (ex: ctrl esquerdo
+        e direito), então o resultado é o produto cartesiano das
+        alternativas, como frozensets prontos para lookup O(1).
+        """
+        steps = keyboard.parse_hotkey(hotkey)
+        # Hotkeys de passo único (ctrl+shift+1); sequências não são usadas
+        alternatives = [
+            tuple(scan_codes) for scan_codes in steps[0]
+        ]
+        return tuple(
+            frozenset(combo) for combo in itertools.product(*alternatives)
+        )
+
+    def bind(self, id: str, hotkey: str, callback: Callable,
              description: str = "") -> bool:
         """
         Registra uma hotkey.
-        
+
         Args:
             id: Identificador único para esta binding
             hotkey: Combinação de teclas (ex: "ctrl+shift+1")
             callback: Função a ser chamada
             description: Descrição da ação
-        
+
         Returns:
             True se registrado com sucesso
         """
+        # Em modo batch, apenas acumula; o registro acontece em end_batch()
+        if self._batch_mode:
+            self._pending.append((id, hotkey, callback, description))
+            return True
+
         with self._lock:
-            # Remove binding anterior se existir
-            if id in self._bindings:
-                self._unbind_internal(id)
-            
-            try:
-                # Normaliza o hotkey
-                hotkey_normalized = hotkey.lower().replace(" ", "")
-                
-                # Registra no keyboard
-                keyboard.add_hotkey(
-                    hotkey_normalized,
-                    callback,
-                    suppress=False,
-                    trigger_on_release=False
-                )
-                
-                # Salva binding
-                self._bindings[id] = HotkeyBinding(
-                    hotkey=hotkey_normalized,
-                    callback=callback,
-                    description=description,
-                    active=True
-                )
-                
-                return True
-            
-            except Exception as e:
-                print(f"Erro ao registrar hotkey '{hotkey}': {e}")
-                return False
-    
+            return self._bind_internal(id, hotkey, callback, description)
+
+    def _bind_internal(self, id: str, hotkey: str, callback: Callable,
+                       description: str = "") -> bool:
+        """Registra uma hotkey (sem lock)."""
+        # Remove binding anterior se existir
+        if id in self._bindings:
+            self._unbind_internal(id)
+
+        try:
+            # Normaliza e compila o hotkey uma única vez
+            hotkey_normalized = hotkey.lower().replace(" ", "")
+            combos = self._compile_hotkey(hotkey_normalized)
+
+            binding = HotkeyBinding(
+                hotkey=hotkey_normalized,
+                callback=callback,
+                description=description,
+                active=True,
+                combos=combos
+            )
+
+            self._bindings[id] = binding
+            for combo in combos:
+                self._combo_table[combo] = binding
+
+            return True
+
+        except Exception as e:
+            print(f"Erro ao registrar hotkey '{hotkey}': {e}")
+            return False
+
+    def begin_batch(self) -> None:
+        """Inicia o modo batch: binds ficam pendentes até end_batch()."""
+        self._batch_mode = True
+
+    def end_batch(self) -> None:
+        """Registra todas as bindings pendentes em uma única passada."""
+        self._batch_mode = False
+
+        with self._lock:
+            for id, hotkey, callback, description in self._pending:
+                self._bind_internal(id, hotkey, callback, description)
+            self._pending.clear()
+
+    def load_bindings(self, bindings) -> None:
+        """
+        Registra várias hotkeys de uma vez.
+
+        Args:
+            bindings: Iterável de tuplas (id, hotkey, callback, description)
+        """
+        self.begin_batch()
+        try:
+            for id, hotkey, callback, description in bindings:
+                self.bind(id, hotkey, callback, description)
+        finally:
+            self.end_batch()
+
     def unbind(self, id: str) -> bool:
         """Remove uma hotkey pelo ID."""
         with self._lock:
             return self._unbind_internal(id)
-    
+
     def _unbind_internal(self, id: str) -> bool:
         """Remove uma hotkey (sem lock)."""
-        if id not in self._bindings:
+        binding = self._bindings.pop(id, None)
+        if binding is None:
             return False
-        
-        binding = self._bindings[id]
-        
-        try:
-            keyboard.remove_hotkey(binding.hotkey)
-        except Exception:
-            pass
-        
-        del self._bindings[id]
+
+        for combo in binding.combos:
+            if self._combo_table.get(combo) is binding:
+                del self._combo_table[combo]
+
         return True
-    
+
     def unbind_all(self) -> None:
         """Remove todas as hotkeys."""
         with self._lock:
-            for id in list(self._bindings.keys()):
-                self._unbind_internal(id)
-    
+            self._bindings.clear()
+            self._combo_table.clear()
+
+    def _on_event(self, event) -> None:
+        """
+        Callback do hook global de teclado.
+
+        Mantém o conjunto de teclas pressionadas e resolve a binding com
+        um único lookup, independente de quantas macros existem.
+        """
+        scan_code = event.scan_code
+        if scan_code is None:
+            return
+
+        if event.event_type == keyboard.KEY_DOWN:
+            self._down.add(scan_code)
+
+            binding = self._combo_table.get(frozenset(self._down))
+            if binding is not None and binding.active:
+                self._dispatch(binding)
+        else:
+            self._down.discard(scan_code)
+
+    def _dispatch(self, binding: HotkeyBinding) -> None:
+        """
+        Agenda o callback de uma binding.
+
+        Executar trabalho dentro do callback do hook de baixo nível trava
+        a fila de input do sistema; aqui apenas enfileiramos (put_nowait é
+        não-bloqueante) e o worker executa fora do hook.
+        """
+        self._events.put_nowait(binding)
+
+    def _worker_loop(self) -> None:
+        """Consome a fila de eventos e executa os callbacks."""
+        _boost_thread_priority()
+
+        while True:
+            binding = self._events.get()
+            if binding is None:  # Sentinela de parada
+                return
+
+            try:
+                binding.callback()
+            except Exception as e:
+                print(f"Erro ao executar hotkey '{binding.hotkey}': {e}")
+
     def start(self) -> None:
         """Ativa o gerenciador de hotkeys."""
         if self._active:
             return
-        
+
         self._active = True
-        
+
+        # Worker que executa os callbacks fora do hook
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+
+        # Um único hook global para todas as bindings
+        self._hook = keyboard.hook(self._on_event)
+
         # Registra tecla de pânico
-        if self._panic_key and self._on_panic:
-            self.bind(
-                f"__panic_{self._panic_key}",
-                self._panic_key,
-                self._on_panic,
-                "Parar todas as macros"
-            )
-    
+        self._register_panic()
+
     def stop(self) -> None:
         """Desativa o gerenciador de hotkeys."""
         if not self._active:
             return
-        
+
         self._active = False
         self.unbind_all()
-    
+
+        if self._hook is not None:
+            try:
+                keyboard.unhook(self._hook)
+            except Exception:
+                pass
+            self._hook = None
+        self._down.clear()
+        self._panic_thread = None
+
+        if self._worker is not None:
+            self._events.put_nowait(None)  # Acorda e encerra o worker
+            self._worker = None
+
     def enable_binding(self, id: str) -> bool:
         """Ativa uma binding específica."""
         with self._lock:
             if id not in self._bindings:
                 return False
-            
-            binding = self._bindings[id]
-            if binding.active:
-                return True
-            
-            try:
-                keyboard.add_hotkey(
-                    binding.hotkey,
-                    binding.callback,
-                    suppress=False
-                )
-                binding.active = True
-                return True
-            except Exception:
-                return False
-    
+
+            self._bindings[id].active = True
+            return True
+
     def disable_binding(self, id: str) -> bool:
         """Desativa temporariamente uma binding."""
         with self._lock:
             if id not in self._bindings:
                 return False
-            
-            binding = self._bindings[id]
-            if not binding.active:
-                return True
-            
-            try:
-                keyboard.remove_hotkey(binding.hotkey)
-                binding.active = False
-                return True
-            except Exception:
-                return False
-    
+
+            self._bindings[id].active = False
+            return True
+
     def get_bindings(self) -> list[tuple[str, HotkeyBinding]]:
-        """Retorna todas as bindings registradas."""
-        with self._lock:
-            return list(self._bindings.items())
-    
+        """
+        Retorna todas as bindings registradas.
+
+        Leitura sem lock: list(dict.items()) é um snapshot atômico sob o
+        GIL, e apenas os caminhos de escrita precisam de exclusão mútua.
+        """
+        return list(self._bindings.items())
+
     def is_hotkey_available(self, hotkey: str) -> bool:
-        """Verifica se uma hotkey está disponível."""
+        """
+        Verifica se uma hotkey está disponível.
+
+        Compara as combinações compiladas de scancodes em vez das
+        strings, então "shift+ctrl+a" e "ctrl+shift+a" são tratadas
+        corretamente como a mesma hotkey.
+        """
         hotkey_normalized = hotkey.lower().replace(" ", "")
-        
-        with self._lock:
-            for binding in self._bindings.values():
-                if binding.hotkey == hotkey_normalized:
-                    return False
+
+        try:
+            combos = set(self._compile_hotkey(hotkey_normalized))
+        except Exception:
+            return False
+
+        # Sem lock: itera um snapshot do dict (seguro sob o GIL)
+        for binding in list(self._bindings.values()):
+            if not combos.isdisjoint(binding.combos):
+                return False
         return True
@@ -1,22 +1,31 @@
 """
 Modelo de dados para macros e ações.
 """
+from array import array
 from dataclasses import dataclass, field
-from typing import Literal, Any
-from enum import Enum
-import uuid
+from typing import Any, Callable, Literal, NamedTuple, Optional
+from enum import Enum, IntEnum
+from secrets import token_hex
+import sys
 import time
 
 
-class ActionType(Enum):
-    """Tipos de ações suportadas."""
-    KEY_PRESS = "key_press"
-    KEY_RELEASE = "key_release"
-    MOUSE_CLICK = "mouse_click"
-    MOUSE_RELEASE = "mouse_release"
-    MOUSE_MOVE = "mouse_move"
-    MOUSE_SCROLL = "mouse_scroll"
-    DELAY = "delay"
+class ActionType(IntEnum):
+    """
+    Tipos de ações suportadas.
+
+    IntEnum: comparações e hashing viram operações de inteiro em C, o
+    que importa no loop de reprodução e nos lookups das tabelas de
+    dispatch. O JSON antigo usava os nomes em minúsculas como valores;
+    from_dict aceita as duas formas.
+    """
+    KEY_PRESS = 1
+    KEY_RELEASE = 2
+    MOUSE_CLICK = 3
+    MOUSE_RELEASE = 4
+    MOUSE_MOVE = 5
+    MOUSE_SCROLL = 6
+    DELAY = 7
 
 
 class MouseButton(Enum):
@@ -26,13 +35,111 @@ class MouseButton(Enum):
     MIDDLE = "middle"
 
 
-@dataclass
+# Índice compacto de cada ActionType (para os arrays compilados)
+_TYPE_INDEX = {t: i for i, t in enumerate(ActionType)}
+
+# Lookup direto valor -> membro, evitando Enum.__call__ no load.
+# Inclui os valores string do schema v1 ("key_press", ...) para
+# compatibilidade com arquivos salvos por versões anteriores.
+_ACTION_BY_VALUE = {t.value: t for t in ActionType}
+_ACTION_BY_VALUE.update({t.name.lower(): t for t in ActionType})
+
+
+class CompiledActions(NamedTuple):
+    """
+    Ações de uma macro em arrays paralelos (SoA) para o hot loop.
+
+    Complementa os __slots__ de MacroAction: a lista de objetos segue
+    sendo a representação canônica/editável, e estes arrays são a visão
+    colunar que o loop de reprodução varre sequencialmente sem tocar
+    nos objetos.
+    """
+    types: array      # Índice do ActionType por ação ('b')
+    delays: array     # delay_before por ação, em ms ('d')
+    ms_delays: array  # Duração dos DELAYs, 0 para os demais tipos ('d')
+
+
+# Campos possíveis de uma ação (um subconjunto é usado por tipo)
+_ACTION_FIELDS = ("key", "x", "y", "button", "dx", "dy", "ms")
+
+# Formatadores de descrição por tipo de ação (montados uma única vez)
+_DESCRIBERS: dict[ActionType, Callable[["MacroAction"], str]] = {
+    ActionType.KEY_PRESS:
+        lambda a: f"⌨️ Pressionar tecla: {a.key or '?'}",
+    ActionType.KEY_RELEASE:
+        lambda a: f"⌨️ Soltar tecla: {a.key or '?'}",
+    ActionType.MOUSE_CLICK:
+        lambda a: (f"🖱️ Clique {a.button or 'left'} em "
+                   f"({a.x or 0}, {a.y or 0})"),
+    ActionType.MOUSE_RELEASE:
+        lambda a: f"🖱️ Soltar botão {a.button or 'left'}",
+    ActionType.MOUSE_MOVE:
+        lambda a: f"🖱️ Mover para ({a.x or 0}, {a.y or 0})",
+    ActionType.MOUSE_SCROLL:
+        lambda a: f"🖱️ Scroll ({a.dx or 0}, {a.dy or 0})",
+    ActionType.DELAY:
+        lambda a: f"⏱️ Aguardar {a.ms or 0}ms",
+}
+
+
 class MacroAction:
-    """Representa uma única ação dentro de uma macro."""
-    action_type: ActionType
-    data: dict[str, Any] = field(default_factory=dict)
-    delay_before: float = 0.0  # Delay em ms antes desta ação
-    
+    """
+    Representa uma única ação dentro de uma macro.
+
+    Usa __slots__ com campos nomeados em vez de um dict `data` por
+    instância: macros gravadas chegam a milhares de ações, e o dict
+    extra praticamente dobrava a memória por ação e custava um lookup
+    por leitura no loop de reprodução.
+    """
+
+    __slots__ = ("action_type", "delay_before", "key", "x", "y",
+                 "button", "dx", "dy", "ms", "_desc", "_delay_prefix")
+
+    def __init__(self, action_type: ActionType,
+                 data: Optional[dict[str, Any]] = None,
+                 delay_before: float = 0.0, *,
+                 key: Optional[str] = None,
+                 x: Optional[int] = None, y: Optional[int] = None,
+                 button: Optional[str] = None,
+                 dx: Optional[int] = None, dy: Optional[int] = None,
+                 ms: Optional[float] = None):
+        self.action_type = action_type
+        self.delay_before = delay_before  # Delay em ms antes desta ação
+        self.key = key
+        self.x = x
+        self.y = y
+        self.button = button
+        self.dx = dx
+        self.dy = dy
+        self.ms = ms
+        self._desc: Optional[str] = None
+        self._delay_prefix: Optional[str] = None
+
+        if data:
+            for name, value in data.items():
+                if name in _ACTION_FIELDS:
+                    setattr(self, name, value)
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Visão em dict dos campos preenchidos (para serialização)."""
+        return {
+            name: getattr(self, name)
+            for name in _ACTION_FIELDS
+            if getattr(self, name) is not None
+        }
+
+    def __repr__(self) -> str:
+        return (f"MacroAction(action_type={self.action_type!r}, "
+                f"data={self.data!r}, delay_before={self.delay_before!r})")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MacroAction):
+            return NotImplemented
+        return (self.action_type == other.action_type and
+                self.delay_before == other.delay_before and
+                self.data == other.data)
+
     def to_dict(self) -> dict:
         """Converte para dicionário para serialização."""
         return {
@@ -44,41 +151,46 @@ class MacroAction:
     @classmethod
     def from_dict(cls, data: dict) -> "MacroAction":
         """Cria uma ação a partir de um dicionário."""
-        return cls(
-            action_type=ActionType(data["action_type"]),
+        action = cls(
+            action_type=_ACTION_BY_VALUE[data["action_type"]],
             data=data.get("data", {}),
             delay_before=data.get("delay_before", 0.0)
         )
+        # Macros gravadas repetem as mesmas teclas/botões milhares de
+        # vezes; interna as strings para que todas as ocorrências
+        # compartilhem o mesmo objeto após o load
+        if type(action.key) is str:
+            action.key = sys.intern(action.key)
+        if type(action.button) is str:
+            action.button = sys.intern(action.button)
+        return action
     
     def get_description(self) -> str:
         """Retorna uma descrição legível da ação."""
-        if self.action_type == ActionType.KEY_PRESS:
-            return f"⌨️ Pressionar tecla: {self.data.get('key', '?')}"
-        elif self.action_type == ActionType.KEY_RELEASE:
-            return f"⌨️ Soltar tecla: {self.data.get('key', '?')}"
-        elif self.action_type == ActionType.MOUSE_CLICK:
-            btn = self.data.get('button', 'left')
-            x, y = self.data.get('x', 0), self.data.get('y', 0)
-            return f"🖱️ Clique {btn} em ({x}, {y})"
-        elif self.action_type == ActionType.MOUSE_RELEASE:
-            btn = self.data.get('button', 'left')
-            return f"🖱️ Soltar botão {btn}"
-        elif self.action_type == ActionType.MOUSE_MOVE:
-            x, y = self.data.get('x', 0), self.data.get('y', 0)
-            return f"🖱️ Mover para ({x}, {y})"
-        elif self.action_type == ActionType.MOUSE_SCROLL:
-            dx, dy = self.data.get('dx', 0), self.data.get('dy', 0)
-            return f"🖱️ Scroll ({dx}, {dy})"
-        elif self.action_type == ActionType.DELAY:
-            ms = self.data.get('ms', 0)
-            return f"⏱️ Aguardar {ms}ms"
-        return "❓ Ação desconhecida"
+        if self._desc is None:
+            describer = _DESCRIBERS.get(self.action_type)
+            if describer is None:
+                return "❓ Ação desconhecida"
+            self._desc = describer(self)
+        return self._desc
+
+    def get_delay_prefix(self) -> str:
+        """Prefixo "[+Nms] " renderizado (cacheado como a descrição)."""
+        if self._delay_prefix is None:
+            self._delay_prefix = (f"[+{self.delay_before:.0f}ms] "
+                                  if self.delay_before > 0 else "")
+        return self._delay_prefix
+
+    def invalidate_description(self) -> None:
+        """Descarta os textos em cache (chamar após alterar os campos)."""
+        self._desc = None
+        self._delay_prefix = None
 
 
 @dataclass
 class Macro:
     """Representa uma macro completa."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=lambda: token_hex(16))
     name: str = "Nova Macro"
     hotkey: str = ""  # Ex: "ctrl+shift+1"
     actions: list[MacroAction] = field(default_factory=list)
@@ -87,7 +199,46 @@ class Macro:
     enabled: bool = True
     created_at: float = field(default_factory=time.time)
     updated_at: float = field(default_factory=time.time)
-    
+    # Representação compilada das ações, construída sob demanda
+    _compiled: Optional[CompiledActions] = field(default=None, init=False,
+                                                 repr=False, compare=False)
+    # Duração total em cache (invalidada junto com _compiled)
+    _total_duration: Optional[float] = field(default=None, init=False,
+                                             repr=False, compare=False)
+    # Contador de versão: a GUI compara com a última versão renderizada
+    # para pular reformatações de texto de itens inalterados
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+
+    def compiled(self) -> CompiledActions:
+        """
+        Retorna as ações compiladas em arrays paralelos.
+
+        O resultado fica em cache até a próxima mutação via
+        add_action/remove_action/move_action (ou invalidate_cache()).
+        """
+        if self._compiled is None:
+            actions = self.actions
+            self._compiled = CompiledActions(
+                types=array('b', (_TYPE_INDEX[a.action_type]
+                                  for a in actions)),
+                delays=array('d', (a.delay_before for a in actions)),
+                ms_delays=array('d', ((a.ms or 0)
+                                      if a.action_type is ActionType.DELAY
+                                      else 0.0
+                                      for a in actions)),
+            )
+        return self._compiled
+
+    def invalidate_cache(self) -> None:
+        """Descarta os caches derivados das ações (após mutação externa)."""
+        self._compiled = None
+        self._total_duration = None
+        self._version += 1
+
+    def bump_version(self) -> None:
+        """Registra uma mutação de metadados (nome, hotkey, enabled...)."""
+        self._version += 1
+
     def to_dict(self) -> dict:
         """Converte para dicionário para serialização."""
         return {
@@ -106,7 +257,7 @@ class Macro:
     def from_dict(cls, data: dict) -> "Macro":
         """Cria uma macro a partir de um dicionário."""
         return cls(
-            id=data.get("id", str(uuid.uuid4())),
+            id=data.get("id", token_hex(16)),
             name=data.get("name", "Nova Macro"),
             hotkey=data.get("hotkey", ""),
             actions=[MacroAction.from_dict(a) for a in data.get("actions", [])],
@@ -117,37 +268,66 @@ class Macro:
             updated_at=data.get("updated_at", time.time())
         )
     
+    @classmethod
+    def from_dict_batch(cls, items: list[dict]) -> list["Macro"]:
+        """
+        Cria várias macros a partir de uma lista de dicionários.
+
+        O caminho rápido parseia tudo em uma comprehension sem
+        try/except por item; se algo falhar, reparseia item a item para
+        pular só as macros inválidas (mesmo comportamento do load
+        antigo), pagando o custo extra apenas no caso raro.
+        """
+        try:
+            return [cls.from_dict(d) for d in items]
+        except Exception:
+            macros = []
+            for d in items:
+                try:
+                    macros.append(cls.from_dict(d))
+                except Exception as e:
+                    print(f"Erro ao carregar macro: {e}")
+            return macros
+
     def add_action(self, action: MacroAction) -> None:
         """Adiciona uma ação à macro."""
         self.actions.append(action)
         self.updated_at = time.time()
-    
+        self._compiled = None
+        self._total_duration = None
+        self._version += 1
+
     def remove_action(self, index: int) -> None:
         """Remove uma ação pelo índice."""
         if 0 <= index < len(self.actions):
             del self.actions[index]
             self.updated_at = time.time()
-    
+            self._compiled = None
+            self._total_duration = None
+            self._version += 1
+
     def move_action(self, from_index: int, to_index: int) -> None:
         """Move uma ação de uma posição para outra."""
         if 0 <= from_index < len(self.actions) and 0 <= to_index < len(self.actions):
             action = self.actions.pop(from_index)
             self.actions.insert(to_index, action)
             self.updated_at = time.time()
-    
+            self._compiled = None
+            self._total_duration = None
+            self._version += 1
+
     def get_total_duration(self) -> float:
         """Calcula a duração total estimada da macro em ms."""
-        total = 0.0
-        for action in self.actions:
-            total += action.delay_before
-            if action.action_type == ActionType.DELAY:
-                total += action.data.get('ms', 0)
-        return total
+        if self._total_duration is None:
+            compiled = self.compiled()
+            self._total_duration = (sum(compiled.delays) +
+                                    sum(compiled.ms_delays))
+        return self._total_duration
     
     def duplicate(self) -> "Macro":
         """Cria uma cópia da macro com novo ID."""
         new_macro = Macro.from_dict(self.to_dict())
-        new_macro.id = str(uuid.uuid4())
+        new_macro.id = token_hex(16)
         new_macro.name = f"{self.name} (cópia)"
         new_macro.created_at = time.time()
         new_macro.updated_at = time.time()
@@ -1,6 +1,9 @@
 """
 Reprodutor de macros - executa ações gravadas.
 """
+import functools
+import queue
+import sys
 import time
 import math
 import threading
@@ -11,6 +14,107 @@ from pynput.keyboard import Key, Controller as KeyboardController
 from pynput.mouse import Button, Controller as MouseController
 
 from .macro import Macro, MacroAction, ActionType
+from . import _smooth_jit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Teclas especiais do pynput por nome, resolvidas no import: o lookup
+# em dict substitui o getattr + AttributeError que estourava em toda
+# tecla de um caractere só
+_KEY_TABLE = {name: getattr(Key, name)
+              for name in dir(Key) if not name.startswith('_')}
+
+_BUTTON_TABLE = {
+    "left": Button.left,
+    "right": Button.right,
+    "middle": Button.middle
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _str_to_key(key_str: str):
+    """Converte string para tecla pynput (resultado em cache)."""
+    return _KEY_TABLE.get(key_str.lower(), key_str)
+
+
+@functools.lru_cache(maxsize=16)
+def _str_to_button(button_str: str) -> Button:
+    """Converte string para botão do mouse (resultado em cache)."""
+    return _BUTTON_TABLE.get(button_str.lower(), Button.left)
+
+
+# --- Emissão em lote das posições do movimento suave (Windows) -------
+#
+# Cada atribuição de mouse.position via pynput atravessa
+# Python -> pynput -> SendInput com um único evento; a 120 passos/s um
+# movimento de 800 ms vira ~100 syscalls. Com um array de INPUTs, um
+# grupo de passos vira uma única chamada a SendInput.
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _MOUSEEVENTF_MOVE = 0x0001
+    _MOUSEEVENTF_ABSOLUTE = 0x8000
+    _MOUSEEVENTF_VIRTUALDESK = 0x4000
+
+    # Métricas da área de trabalho virtual (multi-monitor)
+    _SM_XVIRTUALSCREEN = 76
+    _SM_YVIRTUALSCREEN = 77
+    _SM_CXVIRTUALSCREEN = 78
+    _SM_CYVIRTUALSCREEN = 79
+
+    _ULONG_PTR = ctypes.c_size_t
+
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = [("dx", wintypes.LONG),
+                    ("dy", wintypes.LONG),
+                    ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD),
+                    ("dwExtraInfo", _ULONG_PTR)]
+
+    class _INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD),
+                    ("mi", _MOUSEINPUT)]
+
+    _SendInput = ctypes.windll.user32.SendInput
+    _GetSystemMetrics = ctypes.windll.user32.GetSystemMetrics
+
+    _winmm = ctypes.windll.winmm
+    _kernel32 = ctypes.windll.kernel32
+
+    # Timer de alta resolução (Win10 1803+); cai no Event.wait se a
+    # criação falhar
+    _CREATE_WAITABLE_TIMER_HIGH_RESOLUTION = 0x00000002
+    _TIMER_ALL_ACCESS = 0x1F0003
+    _INFINITE = 0xFFFFFFFF
+
+    def _send_move_batch(xs, ys, start: int, count: int) -> None:
+        """Envia `count` posições a partir de `start` em um SendInput."""
+        vx = _GetSystemMetrics(_SM_XVIRTUALSCREEN)
+        vy = _GetSystemMetrics(_SM_YVIRTUALSCREEN)
+        vw = _GetSystemMetrics(_SM_CXVIRTUALSCREEN) or 1
+        vh = _GetSystemMetrics(_SM_CYVIRTUALSCREEN) or 1
+
+        flags = (_MOUSEEVENTF_MOVE | _MOUSEEVENTF_ABSOLUTE |
+                 _MOUSEEVENTF_VIRTUALDESK)
+        batch = (_INPUT * count)()
+        for i in range(count):
+            mi = batch[i].mi
+            batch[i].type = 0  # INPUT_MOUSE
+            mi.dx = (xs[start + i] - vx) * 65535 // vw
+            mi.dy = (ys[start + i] - vy) * 65535 // vh
+            mi.dwFlags = flags
+        _SendInput(count, batch, ctypes.sizeof(_INPUT))
+
+else:
+    _send_move_batch = None
+    _winmm = None
 
 
 class EasingType(Enum):
@@ -40,31 +144,35 @@ class SmoothMouseMover:
     @staticmethod
     def ease_out_quad(t: float) -> float:
         """Começa rápido, desacelera (quadrático)."""
-        return 1 - (1 - t) * (1 - t)
+        u = 1 - t
+        return 1 - u * u
     
     @staticmethod
     def ease_in_out_quad(t: float) -> float:
         """Suave no início e fim (quadrático)."""
         if t < 0.5:
             return 2 * t * t
-        return 1 - pow(-2 * t + 2, 2) / 2
+        u = -2 * t + 2
+        return 1 - (u * u) / 2
     
     @staticmethod
     def ease_out_cubic(t: float) -> float:
         """Começa rápido, desacelera (cúbico - mais suave)."""
-        return 1 - pow(1 - t, 3)
+        u = 1 - t
+        return 1 - u * u * u
     
     @staticmethod
     def ease_out_expo(t: float) -> float:
         """Desaceleração exponencial (muito suave no final)."""
-        return 1 if t == 1 else 1 - pow(2, -10 * t)
+        return 1 if t == 1 else 1 - math.exp2(-10 * t)
     
     @staticmethod
     def ease_out_back(t: float) -> float:
         """Ultrapassa levemente e volta (efeito de 'overshoot')."""
         c1 = 1.70158
         c3 = c1 + 1
-        return 1 + c3 * pow(t - 1, 3) + c1 * pow(t - 1, 2)
+        u = t - 1
+        return 1 + c3 * u * u * u + c1 * u * u
     
     @classmethod
     def get_easing_function(cls, easing_type: EasingType):
@@ -80,52 +188,164 @@ class SmoothMouseMover:
         }
         return easing_map.get(easing_type, cls.ease_out_quad)
     
+    # Mapeia cada curva para o ID inteiro usado pelos kernels JIT
+    _JIT_EASING_IDS = {
+        EasingType.LINEAR: _smooth_jit.LINEAR,
+        EasingType.EASE_IN: _smooth_jit.EASE_IN_QUAD,
+        EasingType.EASE_OUT: _smooth_jit.EASE_OUT_QUAD,
+        EasingType.EASE_IN_OUT: _smooth_jit.EASE_IN_OUT_QUAD,
+        EasingType.EASE_OUT_QUAD: _smooth_jit.EASE_OUT_QUAD,
+        EasingType.EASE_OUT_CUBIC: _smooth_jit.EASE_OUT_CUBIC,
+        EasingType.EASE_OUT_EXPO: _smooth_jit.EASE_OUT_EXPO,
+    }
+
+    # Tabelas de easing pré-computadas por (curva, nº de passos).
+    # Os valores de t suavizado dependem só desses dois parâmetros, então
+    # movimentos repetidos reutilizam a mesma tabela.
+    _eased_tables: dict[tuple[EasingType, int], list[float]] = {}
+
+    @classmethod
+    def _get_eased_table(cls, easing: EasingType,
+                         total_steps: int) -> list[float]:
+        """Retorna (ou computa) a tabela de t suavizado para a curva."""
+        key = (easing, total_steps)
+        table = cls._eased_tables.get(key)
+        if table is None:
+            easing_func = cls.get_easing_function(easing)
+            table = [easing_func(i / total_steps)
+                     for i in range(total_steps + 1)]
+            cls._eased_tables[key] = table
+        return table
+
     @classmethod
     def calculate_points(cls, start_x: int, start_y: int, end_x: int, end_y: int,
                         duration_ms: float, easing: EasingType = EasingType.EASE_OUT_CUBIC,
-                        steps_per_second: int = 120) -> list[tuple[int, int, float]]:
+                        steps_per_second: int = 120) -> tuple[list[int], list[int], float]:
         """
         Calcula os pontos intermediários para movimento suave.
-        
+
         Args:
             start_x, start_y: Posição inicial
             end_x, end_y: Posição final
             duration_ms: Duração do movimento em milissegundos
             easing: Tipo de curva de easing
             steps_per_second: Quantidade de passos por segundo (frames)
-        
+
         Returns:
-            Lista de tuplas (x, y, delay_ms) com posições e delays
+            Tupla (xs, ys, delay_ms) com as coordenadas em listas
+            paralelas e o delay fixo entre passos
+        """
+        span_x = end_x - start_x
+        span_y = end_y - start_y
+        distance = math.hypot(span_x, span_y)
+
+        # Movimento de poucos pixels: um único posicionamento direto
+        if distance < 3:
+            return [end_x], [end_y], 0.0
+
+        # Número de passos baseado na duração, limitado pela distância:
+        # mais frames do que pixels de trajeto só gera posições
+        # duplicadas (e um syscall por duplicata)
+        duration_sec = duration_ms / 1000
+        total_steps = max(2, min(int(duration_sec * steps_per_second),
+                                 int(distance)))
+
+        # Caminho rápido: kernel compilado (quando numba está instalado)
+        jit_points = _smooth_jit.generate_points(
+            start_x, start_y, end_x, end_y, total_steps,
+            cls._JIT_EASING_IDS.get(easing, _smooth_jit.EASE_OUT_QUAD)
+        )
+        if jit_points is not None:
+            xs, ys = jit_points
+        else:
+            # Curva pré-computada + interpolação em uma passada por eixo
+            eased = cls._get_eased_table(easing, total_steps)
+            xs = [int(start_x + span_x * e) for e in eased]
+            ys = [int(start_y + span_y * e) for e in eased]
+
+        # Remove posições inteiras consecutivas repetidas
+        dedup_x = [xs[0]]
+        dedup_y = [ys[0]]
+        for i in range(1, len(xs)):
+            if xs[i] != dedup_x[-1] or ys[i] != dedup_y[-1]:
+                dedup_x.append(xs[i])
+                dedup_y.append(ys[i])
+
+        # Redistribui a duração pelos passos que sobraram
+        delay_per_step = duration_ms / max(1, len(dedup_x))
+        return dedup_x, dedup_y, delay_per_step
+    
+    @classmethod
+    def calculate_bezier_points(cls, start_x: int, start_y: int,
+                                end_x: int, end_y: int,
+                                ctrl_offset: float,
+                                duration_ms: float,
+                                easing: EasingType = EasingType.EASE_OUT_CUBIC,
+                                steps_per_second: int = 120
+                                ) -> tuple[list[int], list[int], float]:
+        """
+        Calcula um caminho curvo (Bezier cúbica) entre dois pontos.
+
+        Os pontos de controle ficam a 1/3 e 2/3 do trajeto, deslocados
+        perpendicularmente por `ctrl_offset` pixels — o arco natural de
+        um movimento humano em vez da reta perfeita. Com numpy
+        instalado a curva inteira é computada em arrays paralelos (SoA)
+        com uma passada vetorizada por eixo; sem ele, cai em
+        comprehensions sobre a mesma tabela de easing em cache.
+
+        Returns:
+            Tupla (xs, ys, delay_ms) no mesmo formato de
+            calculate_points — arrays/listas paralelas indexáveis pelo
+            emissor em lote
         """
-        # Calcula distância para ajustar duração automaticamente se necessário
-        distance = math.sqrt((end_x - start_x) ** 2 + (end_y - start_y) ** 2)
-        
-        # Número de passos baseado na duração
         duration_sec = duration_ms / 1000
         total_steps = max(2, int(duration_sec * steps_per_second))
-        
-        # Delay entre cada passo
         delay_per_step = duration_ms / total_steps
-        
-        # Função de easing
-        easing_func = cls.get_easing_function(easing)
-        
-        points = []
-        for i in range(total_steps + 1):
-            # Progresso de 0 a 1
-            t = i / total_steps
-            
-            # Aplica easing
-            eased_t = easing_func(t)
-            
-            # Interpola posição
-            x = int(start_x + (end_x - start_x) * eased_t)
-            y = int(start_y + (end_y - start_y) * eased_t)
-            
-            points.append((x, y, delay_per_step))
-        
-        return points
-    
+
+        span_x = end_x - start_x
+        span_y = end_y - start_y
+        dist = math.sqrt(span_x * span_x + span_y * span_y)
+        if dist == 0:
+            return [start_x], [start_y], delay_per_step
+
+        # Vetor perpendicular unitário (define o lado do arco)
+        perp_x = -span_y / dist
+        perp_y = span_x / dist
+
+        # Pontos de controle da Bezier cúbica
+        c1x = start_x + span_x / 3 + perp_x * ctrl_offset
+        c1y = start_y + span_y / 3 + perp_y * ctrl_offset
+        c2x = start_x + 2 * span_x / 3 + perp_x * ctrl_offset
+        c2y = start_y + 2 * span_y / 3 + perp_y * ctrl_offset
+
+        eased = cls._get_eased_table(easing, total_steps)
+
+        if np is not None:
+            t = np.asarray(eased)
+            u = 1.0 - t
+            # Coeficientes de Bernstein, uma vez para os dois eixos
+            b0 = u * u * u
+            b1 = 3.0 * u * u * t
+            b2 = 3.0 * u * t * t
+            b3 = t * t * t
+            xs = (b0 * start_x + b1 * c1x + b2 * c2x
+                  + b3 * end_x).astype(np.int32)
+            ys = (b0 * start_y + b1 * c1y + b2 * c2y
+                  + b3 * end_y).astype(np.int32)
+            return xs, ys, delay_per_step
+
+        xs = []
+        ys = []
+        for t in eased:
+            u = 1.0 - t
+            b0 = u * u * u
+            b1 = 3.0 * u * u * t
+            b2 = 3.0 * u * t * t
+            b3 = t * t * t
+            xs.append(int(b0 * start_x + b1 * c1x + b2 * c2x + b3 * end_x))
+            ys.append(int(b0 * start_y + b1 * c1y + b2 * c2y + b3 * end_y))
+        return xs, ys, delay_per_step
+
     @classmethod
     def calculate_duration_by_distance(cls, start_x: int, start_y: int, 
                                         end_x: int, end_y: int,
@@ -156,15 +376,50 @@ class SmoothMouseMover:
 
 class MacroPlayer:
     """Reproduz macros executando as ações gravadas."""
-    
+
+    # Passos do movimento suave agrupados por SendInput (~50 ms de
+    # movimento a 120 passos/s por chamada)
+    _MOVE_BATCH_STEPS = 6
+
     def __init__(self):
         self._keyboard = KeyboardController()
         self._mouse = MouseController()
         
         self._playing = False
         self._paused = False
-        self._stop_requested = False
-        self._current_thread: Optional[threading.Thread] = None
+
+        # Eventos de controle: parar e retomar (setado = não pausado).
+        # Esperas bloqueiam em primitivas do kernel em vez de busy-poll.
+        self._stop_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+
+        # Worker persistente: play() só enfileira; criar/destruir uma
+        # thread por reprodução custava ms por ciclo de play/stop.
+        # _idle setado = nenhuma macro em execução.
+        self._tasks: queue.SimpleQueue = queue.SimpleQueue()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._worker = threading.Thread(target=self._worker_loop,
+                                        daemon=True,
+                                        name="MacroPlayback")
+        self._worker.start()
+
+        # Timer de alta resolução do Windows para delays curtos; a
+        # resolução padrão de 15.6 ms arredonda um sleep de 8 ms para
+        # o dobro do pedido
+        self._hi_timer = None
+        self._timer_period_active = False
+        if _winmm is not None:
+            self._hi_timer = _kernel32.CreateWaitableTimerExW(
+                None, None,
+                _CREATE_WAITABLE_TIMER_HIGH_RESOLUTION,
+                _TIMER_ALL_ACCESS
+            ) or None
+
+        # Cache da última macro compilada em executores:
+        # (macro.id, macro.updated_at, lista de (fn, args))
+        self._exec_cache: Optional[tuple[str, float, list]] = None
         self._current_macro: Optional[Macro] = None
         self._current_loop = 0
         
@@ -175,6 +430,8 @@ class MacroPlayer:
         self.smooth_mouse_min_duration = 50   # ms
         self.smooth_mouse_max_duration = 800  # ms
         self.smooth_mouse_steps_per_second = 120  # FPS do movimento
+        # Curvatura do caminho em pixels (0 = linha reta)
+        self.smooth_mouse_curvature = 0.0
         
         # Callbacks
         self.on_started: Optional[Callable[[Macro], None]] = None
@@ -184,7 +441,11 @@ class MacroPlayer:
         self.on_action_executed: Optional[Callable[[MacroAction, int], None]] = None
         self.on_loop_completed: Optional[Callable[[int], None]] = None
         self.on_error: Optional[Callable[[Exception], None]] = None
-    
+
+        # Compila o kernel JIT em background para a primeira reprodução
+        # não pagar a latência de compilação
+        _smooth_jit.warmup_async()
+
     @property
     def is_playing(self) -> bool:
         return self._playing
@@ -208,23 +469,30 @@ class MacroPlayer:
         
         self._playing = True
         self._paused = False
-        self._stop_requested = False
+        self._stop_event.clear()
+        self._resume_event.set()
         self._current_macro = macro
         self._current_loop = 0
         
-        self._current_thread = threading.Thread(target=self._play_thread, daemon=True)
-        self._current_thread.start()
+        # Tick de 1 ms do timer do sistema enquanto reproduz
+        if _winmm is not None and not self._timer_period_active:
+            _winmm.timeBeginPeriod(1)
+            self._timer_period_active = True
+        
+        self._idle.clear()
+        self._tasks.put(macro)
         
         if self.on_started:
             self.on_started(macro)
     
     def stop(self) -> None:
         """Para a reprodução da macro."""
-        self._stop_requested = True
+        self._stop_event.set()
         self._paused = False
+        self._resume_event.set()  # Libera quem estava aguardando pausa
         
-        if self._current_thread and self._current_thread.is_alive():
-            self._current_thread.join(timeout=1)
+        # Aguarda o worker terminar a macro atual
+        self._idle.wait(timeout=1)
         
         if self._playing and self._current_macro:
             if self.on_stopped:
@@ -232,12 +500,17 @@ class MacroPlayer:
         
         self._playing = False
         self._current_macro = None
-        self._current_thread = None
+        
+        # Devolve a resolução padrão do timer do sistema
+        if _winmm is not None and self._timer_period_active:
+            _winmm.timeEndPeriod(1)
+            self._timer_period_active = False
     
     def pause(self) -> None:
         """Pausa a reprodução."""
         if self._playing and not self._paused:
             self._paused = True
+            self._resume_event.clear()
             if self.on_paused and self._current_macro:
                 self.on_paused(self._current_macro)
     
@@ -245,6 +518,7 @@ class MacroPlayer:
         """Retoma a reprodução."""
         if self._playing and self._paused:
             self._paused = False
+            self._resume_event.set()
             if self.on_resumed and self._current_macro:
                 self.on_resumed(self._current_macro)
     
@@ -255,44 +529,80 @@ class MacroPlayer:
         else:
             self.pause()
     
+    def _worker_loop(self) -> None:
+        """Loop do worker de reprodução: consome a fila de macros."""
+        while True:
+            macro = self._tasks.get()
+            if macro is None:  # Sentinela (não usado hoje; worker é daemon)
+                return
+            try:
+                self._play_thread()
+            except Exception as e:
+                # compiled()/_compile_executors rodam antes do try de
+                # _play_thread: uma macro malformada estourava aqui e
+                # matava o worker persistente — plays futuros ficavam
+                # enfileirando em uma fila morta, em silêncio
+                self._playing = False
+                if self.on_error:
+                    self.on_error(e)
+            finally:
+                # Devolve a resolução padrão do timer aqui, e não só no
+                # stop(): o término natural da macro nunca passa por
+                # stop() e deixava o período de 1 ms elevado para sempre
+                if _winmm is not None and self._timer_period_active:
+                    _winmm.timeEndPeriod(1)
+                    self._timer_period_active = False
+                self._idle.set()
+
     def _play_thread(self) -> None:
-        """Thread que executa a macro."""
+        """Executa a macro atual (roda no worker persistente)."""
         if not self._current_macro:
             return
         
         macro = self._current_macro
         loop_count = macro.loop_count if macro.loop_count > 0 else float('inf')
-        
+
+        # Arrays compilados (SoA): leitura de delay sem tocar nos objetos
+        delays = macro.compiled().delays
+
+        # Ações especializadas em pares (fn, args): conversão de
+        # tecla/botão e dispatch por tipo acontecem uma única vez
+        executors = self._compile_executors(macro)
+        actions = macro.actions
+
         try:
-            while self._current_loop < loop_count and not self._stop_requested:
+            while self._current_loop < loop_count and not self._stop_event.is_set():
                 self._current_loop += 1
                 
                 # Executa todas as ações
-                for i, action in enumerate(macro.actions):
-                    if self._stop_requested:
+                for i, (fn, args) in enumerate(executors):
+                    if self._stop_event.is_set():
                         break
                     
-                    # Aguarda enquanto pausado
-                    while self._paused and not self._stop_requested:
-                        time.sleep(0.01)
+                    # Aguarda enquanto pausado (stop também libera)
+                    self._resume_event.wait()
                     
-                    if self._stop_requested:
+                    if self._stop_event.is_set():
                         break
                     
                     # Delay antes da ação
-                    if action.delay_before > 0:
-                        self._sleep_ms(action.delay_before)
+                    if delays[i] > 0:
+                        self._sleep_ms(delays[i])
                     
-                    if self._stop_requested:
+                    if self._stop_event.is_set():
                         break
                     
                     # Executa a ação
-                    self._execute_action(action)
+                    try:
+                        fn(*args)
+                    except Exception as e:
+                        print(f"Erro ao executar ação "
+                              f"{actions[i].action_type}: {e}")
                     
                     if self.on_action_executed:
-                        self.on_action_executed(action, i)
+                        self.on_action_executed(actions[i], i)
                 
-                if self.on_loop_completed and not self._stop_requested:
+                if self.on_loop_completed and not self._stop_event.is_set():
                     self.on_loop_completed(self._current_loop)
                 
                 # Delay entre loops
@@ -305,51 +615,124 @@ class MacroPlayer:
         
         finally:
             self._playing = False
-            if not self._stop_requested and self._current_macro:
+            if not self._stop_event.is_set() and self._current_macro:
                 if self.on_stopped:
                     self.on_stopped(self._current_macro)
     
     def _sleep_ms(self, ms: float) -> None:
-        """Dorme por um tempo em milissegundos, verificando stop."""
-        end_time = time.time() + (ms / 1000)
-        while time.time() < end_time and not self._stop_requested:
-            if self._paused:
-                while self._paused and not self._stop_requested:
-                    time.sleep(0.01)
-            time.sleep(0.001)
+        """
+        Aguarda um tempo em milissegundos, verificando stop.
+
+        Bloqueia em Event.wait em vez de acordar a cada 1 ms: a thread
+        estaciona no kernel e retorna na hora quando stop é sinalizado.
+        """
+        deadline = time.monotonic() + (ms / 1000)
+        while not self._stop_event.is_set():
+            # Bloqueia enquanto pausado (stop também libera)
+            self._resume_event.wait()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self._wait_stop(remaining):
+                return
+            # Timeout: delay cumprido, a menos que tenha pausado no meio
+            if self._resume_event.is_set():
+                return
     
+    def _compile_executors(self, macro: Macro) -> list[tuple[Callable, tuple]]:
+        """
+        Especializa as ações da macro em pares (função, argumentos).
+
+        O if/elif de _execute_action e as conversões _str_to_key /
+        _str_to_button rodam uma vez por ação aqui, em vez de uma vez
+        por ação *por loop* durante a reprodução. O resultado fica em
+        cache até a macro ser editada (updated_at muda).
+        """
+        cache = self._exec_cache
+        if (cache is not None and cache[0] == macro.id
+                and cache[1] == macro.updated_at):
+            return cache[2]
+
+        executors: list[tuple[Callable, tuple]] = []
+        for action in macro.actions:
+            action_type = action.action_type
+            if action_type == ActionType.KEY_PRESS:
+                executors.append((self._keyboard.press,
+                                  (_str_to_key(action.key or ""),)))
+            elif action_type == ActionType.KEY_RELEASE:
+                executors.append((self._keyboard.release,
+                                  (_str_to_key(action.key or ""),)))
+            elif action_type == ActionType.MOUSE_CLICK:
+                executors.append((self._do_click,
+                                  (action.x or 0, action.y or 0,
+                                   _str_to_button(action.button or "left"))))
+            elif action_type == ActionType.MOUSE_RELEASE:
+                executors.append((self._mouse.release,
+                                  (_str_to_button(action.button or "left"),)))
+            elif action_type == ActionType.MOUSE_MOVE:
+                executors.append((self._do_move,
+                                  (action.x or 0, action.y or 0)))
+            elif action_type == ActionType.MOUSE_SCROLL:
+                executors.append((self._mouse.scroll,
+                                  (action.dx or 0, action.dy or 0)))
+            else:  # DELAY
+                executors.append((self._sleep_ms, (action.ms or 0,)))
+
+        self._exec_cache = (macro.id, macro.updated_at, executors)
+        return executors
+
+    def _do_click(self, x: int, y: int, button: Button) -> None:
+        """Posiciona o mouse e pressiona o botão (já resolvido)."""
+        self._mouse.position = (x, y)
+        self._mouse.press(button)
+
+    def _do_move(self, x: int, y: int) -> None:
+        """Move o mouse para a posição (setter não é passável direto)."""
+        self._mouse.position = (x, y)
+
+    def _wait_stop(self, seconds: float) -> bool:
+        """
+        Aguarda `seconds`, retornando True se stop foi sinalizado.
+
+        Esperas curtas no Windows usam o waitable timer de alta
+        resolução (precisão sub-ms, essencial para os ~8 ms entre
+        frames do movimento suave); elas não são interrompíveis pelo
+        stop, por isso o limite de 50 ms. O resto usa Event.wait.
+        """
+        if self._hi_timer is not None and seconds < 0.05:
+            due = ctypes.c_longlong(int(seconds * -10_000_000))
+            if _kernel32.SetWaitableTimer(self._hi_timer,
+                                          ctypes.byref(due),
+                                          0, None, None, 0):
+                _kernel32.WaitForSingleObject(self._hi_timer, _INFINITE)
+                return self._stop_event.is_set()
+        return self._stop_event.wait(seconds)
+
     def _execute_action(self, action: MacroAction) -> None:
         """Executa uma ação individual."""
         try:
             if action.action_type == ActionType.KEY_PRESS:
-                self._key_press(action.data.get("key", ""))
-            
+                self._key_press(action.key or "")
+
             elif action.action_type == ActionType.KEY_RELEASE:
-                self._key_release(action.data.get("key", ""))
-            
+                self._key_release(action.key or "")
+
             elif action.action_type == ActionType.MOUSE_CLICK:
-                x = action.data.get("x", 0)
-                y = action.data.get("y", 0)
-                button = action.data.get("button", "left")
-                self._mouse_click(x, y, button)
-            
+                self._mouse_click(action.x or 0, action.y or 0,
+                                  action.button or "left")
+
             elif action.action_type == ActionType.MOUSE_RELEASE:
-                button = action.data.get("button", "left")
-                self._mouse_release(button)
-            
+                self._mouse_release(action.button or "left")
+
             elif action.action_type == ActionType.MOUSE_MOVE:
-                x = action.data.get("x", 0)
-                y = action.data.get("y", 0)
-                self._mouse.position = (x, y)
-            
+                self._mouse.position = (action.x or 0, action.y or 0)
+
             elif action.action_type == ActionType.MOUSE_SCROLL:
-                dx = action.data.get("dx", 0)
-                dy = action.data.get("dy", 0)
-                self._mouse.scroll(dx, dy)
-            
+                self._mouse.scroll(action.dx or 0, action.dy or 0)
+
             elif action.action_type == ActionType.DELAY:
-                ms = action.data.get("ms", 0)
-                self._sleep_ms(ms)
+                self._sleep_ms(action.ms or 0)
         
         except Exception as e:
             print(f"Erro ao executar ação {action.action_type}: {e}")
@@ -381,82 +764,86 @@ class MacroPlayer:
             max_duration_ms=self.smooth_mouse_max_duration
         )
         
-        # Calcula os pontos intermediários
-        points = SmoothMouseMover.calculate_points(
-            start_x, start_y, target_x, target_y,
-            duration_ms=duration,
-            easing=self.smooth_mouse_easing,
-            steps_per_second=self.smooth_mouse_steps_per_second
-        )
-        
-        # Move o mouse por cada ponto
-        for x, y, delay_ms in points:
-            if self._stop_requested:
-                break
-            
-            # Aguarda se pausado
-            while self._paused and not self._stop_requested:
-                time.sleep(0.01)
-            
-            if self._stop_requested:
-                break
-            
-            # Move para a posição
-            self._mouse.position = (x, y)
-            
-            # Delay entre passos
-            if delay_ms > 0:
-                time.sleep(delay_ms / 1000)
+        # Calcula os pontos intermediários (arrays/listas paralelas)
+        if self.smooth_mouse_curvature:
+            xs, ys, delay_ms = SmoothMouseMover.calculate_bezier_points(
+                start_x, start_y, target_x, target_y,
+                ctrl_offset=self.smooth_mouse_curvature,
+                duration_ms=duration,
+                easing=self.smooth_mouse_easing,
+                steps_per_second=self.smooth_mouse_steps_per_second
+            )
+        else:
+            xs, ys, delay_ms = SmoothMouseMover.calculate_points(
+                start_x, start_y, target_x, target_y,
+                duration_ms=duration,
+                easing=self.smooth_mouse_easing,
+                steps_per_second=self.smooth_mouse_steps_per_second
+            )
+
+        if _send_move_batch is not None:
+            # Caminho Windows: emite grupos de passos em um SendInput
+            # só, com uma única espera pela duração do grupo
+            total = len(xs)
+            i = 0
+            while i < total and not self._stop_event.is_set():
+                # Aguarda se pausado (stop também libera)
+                self._resume_event.wait()
+                if self._stop_event.is_set():
+                    break
+
+                end = min(i + self._MOVE_BATCH_STEPS, total)
+                _send_move_batch(xs, ys, i, end - i)
+
+                wait_s = (end - i) * delay_ms / 1000
+                if wait_s > 0 and self._wait_stop(wait_s):
+                    break
+                i = end
+        else:
+            # Fallback: um evento de posição por passo via pynput
+            for x, y in zip(xs, ys):
+                if self._stop_event.is_set():
+                    break
+
+                # Aguarda se pausado (stop também libera)
+                self._resume_event.wait()
+
+                if self._stop_event.is_set():
+                    break
+
+                # Move para a posição
+                self._mouse.position = (x, y)
+
+                # Delay entre passos (aborta se stop for sinalizado)
+                if delay_ms > 0 and self._wait_stop(delay_ms / 1000):
+                    break
         
         # Garante que termina na posição exata
-        if not self._stop_requested:
+        if not self._stop_event.is_set():
             self._mouse.position = (target_x, target_y)
     
-    def _str_to_key(self, key_str: str):
-        """Converte string para tecla pynput."""
-        # Tenta teclas especiais
-        try:
-            return getattr(Key, key_str.lower())
-        except AttributeError:
-            pass
-        
-        # Se for um único caractere, retorna direto
-        if len(key_str) == 1:
-            return key_str
-        
-        return key_str
-    
     def _key_press(self, key_str: str) -> None:
         """Pressiona uma tecla."""
-        key = self._str_to_key(key_str)
+        key = _str_to_key(key_str)
         self._keyboard.press(key)
     
     def _key_release(self, key_str: str) -> None:
         """Solta uma tecla."""
-        key = self._str_to_key(key_str)
+        key = _str_to_key(key_str)
         self._keyboard.release(key)
     
-    def _str_to_button(self, button_str: str) -> Button:
-        """Converte string para botão do mouse."""
-        button_map = {
-            "left": Button.left,
-            "right": Button.right,
-            "middle": Button.middle
-        }
-        return button_map.get(button_str.lower(), Button.left)
-    
     def _mouse_click(self, x: int, y: int, button_str: str) -> None:
         """Clica em uma posição (movimento instantâneo)."""
         self._mouse.position = (x, y)
-        button = self._str_to_button(button_str)
+        button = _str_to_button(button_str)
         self._mouse.press(button)
     
     def _mouse_click_at_current(self, button_str: str) -> None:
         """Clica na posição atual do mouse."""
-        button = self._str_to_button(button_str)
+        button = _str_to_button(button_str)
         self._mouse.press(button)
     
     def _mouse_release(self, button_str: str) -> None:
         """Solta um botão do mouse."""
-        button = self._str_to_button(button_str)
+        button = _str_to_button(button_str)
         self._mouse.release(button)
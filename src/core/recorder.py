@@ -4,9 +4,9 @@ Gravador de macros - captura eventos de teclado e mouse.
 import time
 import threading
 from typing import Callable, Optional
-from pynput import keyboard, mouse
 
 from .macro import Macro, MacroAction, ActionType, MouseButton
+from . import _hooks_win32
 
 
 class MacroRecorder:
@@ -15,16 +15,20 @@ class MacroRecorder:
     def __init__(self):
         self._recording = False
         self._actions: list[MacroAction] = []
-        self._start_time: float = 0
-        self._last_action_time: float = 0
+        self._start_time: int = 0       # Em ns (relógio monotônico)
+        self._last_action_time: int = 0
         
-        self._keyboard_listener: Optional[keyboard.Listener] = None
-        self._mouse_listener: Optional[mouse.Listener] = None
+        # Listeners do pynput (fallback; o import é adiado para o
+        # start(), já que no Windows o hook nativo dispensa o pynput)
+        self._keyboard_listener = None
+        self._mouse_listener = None
+        self._hook_listener: Optional[_hooks_win32.LowLevelHookListener] = None
         
         # Configurações
         self.record_mouse_movement = False
         self.record_key_release = True
-        self.min_movement_distance = 10  # Pixels mínimos para registrar movimento
+        self._min_movement_distance = 10
+        self._min_move_dist_sq = 100
         
         # Callbacks
         self.on_action_recorded: Optional[Callable[[MacroAction], None]] = None
@@ -37,6 +41,17 @@ class MacroRecorder:
     @property
     def is_recording(self) -> bool:
         return self._recording
+
+    @property
+    def min_movement_distance(self) -> int:
+        """Pixels mínimos para registrar movimento do mouse."""
+        return self._min_movement_distance
+
+    @min_movement_distance.setter
+    def min_movement_distance(self, value: int) -> None:
+        self._min_movement_distance = value
+        # Quadrado em cache: o filtro compara distâncias ao quadrado
+        self._min_move_dist_sq = value * value
     
     def start(self) -> None:
         """Inicia a gravação."""
@@ -45,34 +60,63 @@ class MacroRecorder:
         
         self._recording = True
         self._actions = []
-        self._start_time = time.time() * 1000  # Em ms
+        # Relógio monotônico em ns: deltas são uma subtração de
+        # inteiros e nunca ficam negativos por ajuste de NTP
+        self._start_time = time.monotonic_ns()
         self._last_action_time = self._start_time
         
-        # Inicia listeners
-        self._keyboard_listener = keyboard.Listener(
-            on_press=self._on_key_press,
-            on_release=self._on_key_release
-        )
-        self._mouse_listener = mouse.Listener(
-            on_click=self._on_mouse_click,
-            on_scroll=self._on_mouse_scroll,
-            on_move=self._on_mouse_move if self.record_mouse_movement else None
-        )
-        
-        self._keyboard_listener.start()
-        self._mouse_listener.start()
+        if _hooks_win32.is_available():
+            # Windows: um único par de hooks LL em uma thread só, com
+            # timestamps do SO, no lugar das duas threads do pynput
+            self._hook_listener = _hooks_win32.LowLevelHookListener(
+                on_key=self._on_hook_key,
+                on_click=self._on_hook_click,
+                on_scroll=self._on_hook_scroll,
+                on_move=(self._on_hook_move
+                         if self.record_mouse_movement else None)
+            )
+            self._hook_listener.start()
+        else:
+            # Fallback: listeners do pynput (import no primeiro uso;
+            # sys.modules torna os seguintes gratuitos)
+            from pynput import keyboard, mouse
+            
+            self._keyboard_listener = keyboard.Listener(
+                on_press=self._on_key_press,
+                on_release=self._on_key_release
+            )
+            self._mouse_listener = mouse.Listener(
+                on_click=self._on_mouse_click,
+                on_scroll=self._on_mouse_scroll,
+                on_move=(self._on_mouse_move
+                         if self.record_mouse_movement else None)
+            )
+            
+            self._keyboard_listener.start()
+            self._mouse_listener.start()
         
         if self.on_recording_started:
             self.on_recording_started()
     
     def stop(self) -> list[MacroAction]:
-        """Para a gravação e retorna as ações gravadas."""
+        """
+        Para a gravação e retorna as ações gravadas.
+
+        A lista retornada é o próprio buffer interno (transferência de
+        posse, sem cópia — gravações longas chegam a centenas de
+        milhares de ações). start() aloca um buffer novo, então a lista
+        retornada nunca é mutada por uma gravação posterior.
+        """
         if not self._recording:
             return []
         
         self._recording = False
         
         # Para listeners
+        if self._hook_listener:
+            self._hook_listener.stop()
+            self._hook_listener = None
+        
         if self._keyboard_listener:
             self._keyboard_listener.stop()
             self._keyboard_listener = None
@@ -81,36 +125,122 @@ class MacroRecorder:
             self._mouse_listener.stop()
             self._mouse_listener = None
         
-        actions = self._actions.copy()
-        
+        actions = self._actions
+
         if self.on_recording_stopped:
             self.on_recording_stopped(actions)
-        
+
         return actions
-    
-    def create_macro(self, name: str = "Macro Gravada") -> Macro:
-        """Cria uma macro com as ações gravadas."""
+
+    def create_macro(self, name: str = "Macro Gravada",
+                     actions: Optional[list[MacroAction]] = None) -> Macro:
+        """
+        Cria uma macro com as ações gravadas.
+
+        A lista é atribuída diretamente (mesma semântica de posse de
+        stop()); passe `actions` para usar uma lista já obtida de
+        stop() em vez do buffer interno.
+        """
         macro = Macro(name=name)
-        macro.actions = self._actions.copy()
+        macro.actions = actions if actions is not None else self._actions
         return macro
     
-    def _add_action(self, action: MacroAction) -> None:
-        """Adiciona uma ação à lista."""
-        current_time = time.time() * 1000
+    def _add_action(self, action: MacroAction,
+                    event_time_ms: Optional[float] = None) -> None:
+        """
+        Adiciona uma ação à lista.
+
+        `event_time_ms` é o timestamp do SO quando o evento veio do
+        hook nativo; dentro de uma gravação a fonte de tempo é sempre a
+        mesma, então só os deltas importam.
+        """
+        now = (int(event_time_ms) * 1_000_000
+               if event_time_ms is not None
+               else time.monotonic_ns())
         
         # Primeira ação não tem delay (ignorar tempo da contagem regressiva)
         if len(self._actions) == 0:
             action.delay_before = 0
         else:
-            action.delay_before = current_time - self._last_action_time
+            action.delay_before = (now - self._last_action_time) // 1_000_000
         
-        self._last_action_time = current_time
+        self._last_action_time = now
         
         self._actions.append(action)
         
         if self.on_action_recorded:
             self.on_action_recorded(action)
     
+    # --- Callbacks do hook nativo (Windows) --------------------------
+
+    def _on_hook_key(self, key_str: str, pressed: bool,
+                     time_ms: float) -> None:
+        """Callback de tecla vindo do hook de baixo nível."""
+        if not self._recording:
+            return
+        if not pressed and not self.record_key_release:
+            return
+        
+        action = MacroAction(
+            action_type=(ActionType.KEY_PRESS if pressed
+                         else ActionType.KEY_RELEASE),
+            key=key_str
+        )
+        self._add_action(action, time_ms)
+
+    def _on_hook_click(self, x: int, y: int, button_str: str,
+                       pressed: bool, time_ms: float) -> None:
+        """Callback de clique vindo do hook de baixo nível."""
+        if not self._recording:
+            return
+        
+        action = MacroAction(
+            action_type=(ActionType.MOUSE_CLICK if pressed
+                         else ActionType.MOUSE_RELEASE),
+            x=x, y=y, button=button_str
+        )
+        self._add_action(action, time_ms)
+
+    def _on_hook_scroll(self, x: int, y: int, dx: int, dy: int,
+                        time_ms: float) -> None:
+        """Callback de scroll vindo do hook de baixo nível."""
+        if not self._recording:
+            return
+        
+        action = MacroAction(
+            action_type=ActionType.MOUSE_SCROLL,
+            x=x, y=y, dx=dx, dy=dy
+        )
+        self._add_action(action, time_ms)
+
+    def _on_hook_move(self, x: int, y: int, time_ms: float) -> None:
+        """Callback de movimento vindo do hook de baixo nível."""
+        if not self._recording or not self._passes_move_filter(x, y):
+            return
+        
+        action = MacroAction(
+            action_type=ActionType.MOUSE_MOVE,
+            x=x, y=y
+        )
+        self._add_action(action, time_ms)
+
+    def _passes_move_filter(self, x: int, y: int) -> bool:
+        """
+        Aplica o filtro de distância mínima (ao quadrado, sem sqrt) e
+        atualiza a última posição quando o movimento passa.
+        """
+        last_x, last_y = self._last_mouse_pos
+        dx = x - last_x
+        dy = y - last_y
+        m = self._min_movement_distance
+        if (-m <= dx <= m and -m <= dy <= m
+                and dx * dx + dy * dy < self._min_move_dist_sq):
+            return False
+        self._last_mouse_pos = (x, y)
+        return True
+
+    # --- Callbacks do pynput (fallback) ------------------------------
+
     def _key_to_str(self, key) -> str:
         """Converte uma tecla para string."""
         try:
@@ -128,7 +258,7 @@ class MacroRecorder:
         key_str = self._key_to_str(key)
         action = MacroAction(
             action_type=ActionType.KEY_PRESS,
-            data={"key": key_str}
+            key=key_str
         )
         self._add_action(action)
     
@@ -140,7 +270,7 @@ class MacroRecorder:
         key_str = self._key_to_str(key)
         action = MacroAction(
             action_type=ActionType.KEY_RELEASE,
-            data={"key": key_str}
+            key=key_str
         )
         self._add_action(action)
     
@@ -154,12 +284,12 @@ class MacroRecorder:
         if pressed:
             action = MacroAction(
                 action_type=ActionType.MOUSE_CLICK,
-                data={"x": x, "y": y, "button": button_str}
+                x=x, y=y, button=button_str
             )
         else:
             action = MacroAction(
                 action_type=ActionType.MOUSE_RELEASE,
-                data={"x": x, "y": y, "button": button_str}
+                x=x, y=y, button=button_str
             )
         
         self._add_action(action)
@@ -171,7 +301,7 @@ class MacroRecorder:
         
         action = MacroAction(
             action_type=ActionType.MOUSE_SCROLL,
-            data={"x": x, "y": y, "dx": dx, "dy": dy}
+            x=x, y=y, dx=dx, dy=dy
         )
         self._add_action(action)
     
@@ -180,17 +310,11 @@ class MacroRecorder:
         if not self._recording:
             return
         
-        # Filtra movimentos muito pequenos
-        last_x, last_y = self._last_mouse_pos
-        distance = ((x - last_x) ** 2 + (y - last_y) ** 2) ** 0.5
-        
-        if distance < self.min_movement_distance:
+        if not self._passes_move_filter(x, y):
             return
         
-        self._last_mouse_pos = (x, y)
-        
         action = MacroAction(
             action_type=ActionType.MOUSE_MOVE,
-            data={"x": x, "y": y}
+            x=x, y=y
         )
         self._add_action(action)
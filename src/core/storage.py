@@ -1,22 +1,45 @@
 """
 Sistema de persistência para macros.
 """
-import json
-import shutil
+import atexit
+import os
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
 from .macro import Macro
+from ..utils import jsonio
 from ..utils.helpers import get_macros_file, get_data_dir
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 
 class MacroStorage:
-    """Gerencia o armazenamento de macros em JSON."""
-    
+    """
+    Gerencia o armazenamento de macros em JSON.
+
+    As macros ficam em um índice em memória (id -> Macro) carregado uma
+    única vez; mutações atualizam o índice em O(1) e marcam o arquivo
+    como sujo. A escrita em disco é adiada e coalescida (_FLUSH_DELAY),
+    então uma rajada de edições vira um único save.
+    """
+
+    # Janela de coalescência entre a mutação e a escrita em disco
+    _FLUSH_DELAY = 0.5
+
     def __init__(self, file_path: Optional[Path] = None):
         self.file_path = file_path or get_macros_file()
+        self._cache: Optional[dict[str, Macro]] = None
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
         self._ensure_file_exists()
+        # Garante que edições pendentes cheguem ao disco ao sair
+        atexit.register(self.flush)
     
     def _ensure_file_exists(self) -> None:
         """Garante que o arquivo de macros existe."""
@@ -27,72 +50,89 @@ class MacroStorage:
     def _load_data(self) -> dict:
         """Carrega o arquivo JSON."""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            return jsonio.load_file(self.file_path)
+        except (ValueError, FileNotFoundError):
             return {"macros": [], "version": 1}
     
     def _save_data(self, data: dict) -> None:
-        """Salva dados no arquivo JSON."""
-        # Cria backup antes de salvar
+        """
+        Salva dados no arquivo JSON, com rotação de backup por rename.
+
+        O snapshot anterior vira o .bak com um os.replace (atualização
+        O(1) da entrada de diretório) em vez do copy2 que relia e
+        regravava o arquivo inteiro a cada save. O novo conteúdo é
+        escrito em um .tmp com fsync antes das trocas, então tanto o
+        arquivo atual quanto o backup são sempre snapshots íntegros.
+        """
+        tmp_path = self.file_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(jsonio.dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+
         if self.file_path.exists():
-            backup_path = self.file_path.with_suffix('.json.bak')
-            shutil.copy2(self.file_path, backup_path)
-        
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(self.file_path,
+                       self.file_path.with_suffix('.json.bak'))
+        os.replace(tmp_path, self.file_path)
     
+    def _ensure_cache(self) -> dict[str, Macro]:
+        """Carrega o índice em memória na primeira utilização."""
+        if self._cache is None:
+            data = self._load_data()
+            macros = Macro.from_dict_batch(data.get("macros", []))
+            self._cache = {m.id: m for m in macros}
+        return self._cache
+
+    def _mark_dirty(self) -> None:
+        """Marca o arquivo como desatualizado e agenda o flush."""
+        with self._flush_lock:
+            self._dirty = True
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(self._FLUSH_DELAY,
+                                                self.flush)
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Escreve as mudanças pendentes em disco (no-op se não há)."""
+        with self._flush_lock:
+            if not self._dirty or self._cache is None:
+                return
+            self._dirty = False
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            data = {
+                "macros": [m.to_dict() for m in self._cache.values()],
+                "version": 1,
+                "updated_at": datetime.now().isoformat()
+            }
+        self._save_data(data)
+
     def load_all(self) -> list[Macro]:
-        """Carrega todas as macros."""
-        data = self._load_data()
-        macros = []
-        for macro_data in data.get("macros", []):
-            try:
-                macros.append(Macro.from_dict(macro_data))
-            except Exception as e:
-                print(f"Erro ao carregar macro: {e}")
-        return macros
+        """Carrega todas as macros (do cache após a primeira leitura)."""
+        return list(self._ensure_cache().values())
     
     def save_all(self, macros: list[Macro]) -> None:
         """Salva todas as macros."""
-        data = {
-            "macros": [m.to_dict() for m in macros],
-            "version": 1,
-            "updated_at": datetime.now().isoformat()
-        }
-        self._save_data(data)
+        self._cache = {m.id: m for m in macros}
+        self._mark_dirty()
     
     def save_macro(self, macro: Macro) -> None:
         """Salva ou atualiza uma macro específica."""
-        macros = self.load_all()
-        
-        # Procura macro existente
-        for i, m in enumerate(macros):
-            if m.id == macro.id:
-                macros[i] = macro
-                break
-        else:
-            macros.append(macro)
-        
-        self.save_all(macros)
+        self._ensure_cache()[macro.id] = macro
+        self._mark_dirty()
     
     def delete_macro(self, macro_id: str) -> bool:
         """Remove uma macro pelo ID."""
-        macros = self.load_all()
-        original_len = len(macros)
-        macros = [m for m in macros if m.id != macro_id]
-        
-        if len(macros) < original_len:
-            self.save_all(macros)
+        if self._ensure_cache().pop(macro_id, None) is not None:
+            self._mark_dirty()
             return True
         return False
     
     def get_macro(self, macro_id: str) -> Optional[Macro]:
         """Busca uma macro pelo ID."""
-        for macro in self.load_all():
-            if macro.id == macro_id:
-                return macro
-        return None
+        return self._ensure_cache().get(macro_id)
     
     def export_macro(self, macro: Macro, file_path: Path) -> None:
         """Exporta uma macro para um arquivo."""
@@ -102,8 +142,7 @@ class MacroStorage:
             "exported_at": datetime.now().isoformat(),
             "macro": macro.to_dict()
         }
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        jsonio.dump_file(data, file_path)
     
     def export_all(self, macros: list[Macro], file_path: Path) -> None:
         """Exporta múltiplas macros para um arquivo."""
@@ -113,13 +152,21 @@ class MacroStorage:
             "exported_at": datetime.now().isoformat(),
             "macros": [m.to_dict() for m in macros]
         }
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        jsonio.dump_file(data, file_path)
     
     def import_macros(self, file_path: Path) -> list[Macro]:
-        """Importa macros de um arquivo."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        """
+        Importa macros de um arquivo.
+
+        Com o ijson instalado o arquivo é parseado em streaming: uma
+        macro materializada por vez em vez do dicionário inteiro em
+        memória (exportações grandes chegam a centenas de MB). Sem
+        ele, cai no load completo de antes.
+        """
+        if ijson is not None:
+            return self._import_macros_streaming(file_path)
+        
+        data = jsonio.load_file(file_path)
         
         if data.get("type") != "macrowing_export":
             raise ValueError("Arquivo não é uma exportação válida do MacroWing")
@@ -132,7 +179,43 @@ class MacroStorage:
         
         # Importação em lote
         if "macros" in data:
-            for macro_data in data["macros"]:
+            imported.extend(Macro.from_dict_batch(data["macros"]))
+        
+        return imported
+
+    def _import_macros_streaming(self, file_path: Path) -> list[Macro]:
+        """
+        Importação incremental via ijson.
+
+        Faz passadas sequenciais baratas pelo arquivo (validação do
+        cabeçalho, macro individual, lote) em troca de pico de memória
+        O(uma macro) — os eventos do parser não materializam os
+        objetos fora do prefixo pedido.
+        """
+        # Valida o cabeçalho sem materializar o resto
+        valid = False
+        with open(file_path, 'rb') as f:
+            for prefix, _, value in ijson.parse(f):
+                if prefix == "type":
+                    valid = value == "macrowing_export"
+                    break
+        if not valid:
+            raise ValueError("Arquivo não é uma exportação válida do MacroWing")
+        
+        imported = []
+
+        # use_float: sem ele o ijson entrega números como Decimal, que
+        # o encoder JSON rejeita no save seguinte — a macro importada
+        # nunca chegaria ao disco
+        # Importação individual
+        with open(file_path, 'rb') as f:
+            for macro_data in ijson.items(f, 'macro', use_float=True):
+                imported.append(Macro.from_dict(macro_data))
+
+        # Importação em lote, uma macro materializada por vez
+        with open(file_path, 'rb') as f:
+            for macro_data in ijson.items(f, 'macros.item',
+                                          use_float=True):
                 imported.append(Macro.from_dict(macro_data))
         
         return imported
@@ -1,25 +1,46 @@
 """
 Editor de macros.
 """
+import functools
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QGridLayout,
     QLineEdit, QSpinBox, QDoubleSpinBox, QPushButton, QLabel,
     QListWidget, QListWidgetItem, QComboBox, QCheckBox,
     QGroupBox, QFrame, QMenu, QMessageBox, QDialog,
-    QDialogButtonBox
+    QDialogButtonBox, QStackedWidget
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QKeySequence
 
 from ..core.macro import Macro, MacroAction, ActionType
 from .styles import COLORS
 
 
+@functools.lru_cache(maxsize=128)
+def _key_text(key: int) -> str:
+    """Nome da tecla via QKeySequence, memoizado por código."""
+    return QKeySequence(key).toString()
+
+
 class HotkeyLineEdit(QLineEdit):
     """LineEdit especial para capturar hotkeys."""
     
     hotkey_changed = pyqtSignal(str)
     
+    # (bit do modificador, rótulo) — decodificação em uma passada
+    _MOD_TABLE = tuple(
+        (int(mod), name) for mod, name in (
+            (Qt.KeyboardModifier.ControlModifier, "Ctrl"),
+            (Qt.KeyboardModifier.AltModifier, "Alt"),
+            (Qt.KeyboardModifier.ShiftModifier, "Shift"),
+            (Qt.KeyboardModifier.MetaModifier, "Win"),
+        )
+    )
+    
+    _MODIFIER_KEYS = frozenset((Qt.Key.Key_Control, Qt.Key.Key_Alt,
+                                Qt.Key.Key_Shift, Qt.Key.Key_Meta))
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setPlaceholderText("Clique e pressione uma combinação...")
@@ -28,32 +49,29 @@ class HotkeyLineEdit(QLineEdit):
     
     def keyPressEvent(self, event):
         """Captura a combinação de teclas."""
+        # Autorepeat de tecla segurada produziria a mesma hotkey de novo
+        if event.isAutoRepeat():
+            return
         key = event.key()
-        modifiers = event.modifiers()
+        mods = int(event.modifiers().value)
         
-        parts = []
-        
-        if modifiers & Qt.KeyboardModifier.ControlModifier:
-            parts.append("Ctrl")
-        if modifiers & Qt.KeyboardModifier.AltModifier:
-            parts.append("Alt")
-        if modifiers & Qt.KeyboardModifier.ShiftModifier:
-            parts.append("Shift")
-        if modifiers & Qt.KeyboardModifier.MetaModifier:
-            parts.append("Win")
+        parts = [name for bit, name in self._MOD_TABLE if mods & bit]
         
         # Adiciona a tecla se não for um modificador
-        if key not in (Qt.Key.Key_Control, Qt.Key.Key_Alt, 
-                       Qt.Key.Key_Shift, Qt.Key.Key_Meta):
-            key_text = QKeySequence(key).toString()
+        if key not in self._MODIFIER_KEYS:
+            key_text = _key_text(key)
             if key_text:
                 parts.append(key_text)
         
         if parts:
             hotkey = "+".join(parts)
+            # Mesmo texto => nada a repintar nem a notificar
+            if hotkey == self.text():
+                return
             self.setText(hotkey)
             self.hotkey_changed.emit(hotkey)
     
+    @pyqtSlot()
     def clear_hotkey(self):
         """Limpa a hotkey."""
         self.clear()
@@ -67,15 +85,18 @@ class ActionListItem(QListWidgetItem):
         super().__init__()
         self.action = action
         self.index = index
+        self._last_key: tuple | None = None
         self.update_display()
     
     def update_display(self) -> None:
-        """Atualiza o texto exibido."""
-        delay_str = ""
-        if self.action.delay_before > 0:
-            delay_str = f"[+{self.action.delay_before:.0f}ms] "
+        """Atualiza o texto exibido (no-op se nada mudou)."""
+        key = (self.index, self.action.delay_before, id(self.action))
+        if key == self._last_key:
+            return
         
-        self.setText(f"{self.index + 1}. {delay_str}{self.action.get_description()}")
+        self.setText(f"{self.index + 1}. {self.action.get_delay_prefix()}"
+                     f"{self.action.get_description()}")
+        self._last_key = key
 
 
 class AddActionDialog(QDialog):
@@ -104,13 +125,11 @@ class AddActionDialog(QDialog):
         type_layout.addRow("Tipo:", self.type_combo)
         layout.addLayout(type_layout)
         
-        # Container para campos dinâmicos
-        self.fields_container = QWidget()
-        self.fields_layout = QFormLayout(self.fields_container)
-        layout.addWidget(self.fields_container)
-        
-        # Campos
-        self._create_fields()
+        # Uma página pré-montada por tipo de ação; trocar de tipo é um
+        # setCurrentIndex em vez de desmontar e remontar o form
+        self.pages = QStackedWidget()
+        self._create_pages()
+        layout.addWidget(self.pages)
         
         # Delay antes
         delay_layout = QFormLayout()
@@ -131,8 +150,8 @@ class AddActionDialog(QDialog):
         
         self._on_type_changed(0)
     
-    def _create_fields(self) -> None:
-        """Cria todos os campos possíveis."""
+    def _create_pages(self) -> None:
+        """Cria as páginas de campos, uma por tipo de ação."""
         # Campo de tecla
         self.key_edit = QLineEdit()
         self.key_edit.setPlaceholderText("Ex: a, space, enter, f1")
@@ -152,29 +171,45 @@ class AddActionDialog(QDialog):
         self.delay_ms_spin.setRange(1, 60000)
         self.delay_ms_spin.setValue(100)
         self.delay_ms_spin.setSuffix(" ms")
+        
+        # Cada página tem seus próprios widgets (um widget Qt só pode
+        # ter um pai); índices seguem os do type_combo
+        self._key_release_edit = QLineEdit()
+        self._key_release_edit.setPlaceholderText("Ex: a, space, enter, f1")
+        
+        key_page = QWidget()
+        QFormLayout(key_page).addRow("Tecla:", self.key_edit)
+        self.pages.addWidget(key_page)  # 0: pressionar tecla
+        
+        release_page = QWidget()
+        QFormLayout(release_page).addRow("Tecla:", self._key_release_edit)
+        self.pages.addWidget(release_page)  # 1: soltar tecla
+        
+        click_page = QWidget()
+        click_layout = QFormLayout(click_page)
+        click_layout.addRow("X:", self.x_spin)
+        click_layout.addRow("Y:", self.y_spin)
+        click_layout.addRow("Botão:", self.button_combo)
+        self.pages.addWidget(click_page)  # 2: clique
+        
+        move_page = QWidget()
+        move_layout = QFormLayout(move_page)
+        self._move_x_spin = QSpinBox()
+        self._move_x_spin.setRange(0, 9999)
+        self._move_y_spin = QSpinBox()
+        self._move_y_spin.setRange(0, 9999)
+        move_layout.addRow("X:", self._move_x_spin)
+        move_layout.addRow("Y:", self._move_y_spin)
+        self.pages.addWidget(move_page)  # 3: mover
+        
+        delay_page = QWidget()
+        QFormLayout(delay_page).addRow("Tempo:", self.delay_ms_spin)
+        self.pages.addWidget(delay_page)  # 4: delay
     
-    def _clear_fields_layout(self) -> None:
-        """Remove todos os widgets do layout de campos."""
-        while self.fields_layout.count():
-            item = self.fields_layout.takeAt(0)
-            if item.widget():
-                item.widget().setParent(None)
-    
+    @pyqtSlot(int)
     def _on_type_changed(self, index: int) -> None:
-        """Atualiza os campos com base no tipo selecionado."""
-        self._clear_fields_layout()
-        
-        if index in (0, 1):  # Tecla
-            self.fields_layout.addRow("Tecla:", self.key_edit)
-        elif index == 2:  # Clique
-            self.fields_layout.addRow("X:", self.x_spin)
-            self.fields_layout.addRow("Y:", self.y_spin)
-            self.fields_layout.addRow("Botão:", self.button_combo)
-        elif index == 3:  # Mover
-            self.fields_layout.addRow("X:", self.x_spin)
-            self.fields_layout.addRow("Y:", self.y_spin)
-        elif index == 4:  # Delay
-            self.fields_layout.addRow("Tempo:", self.delay_ms_spin)
+        """Troca a página de campos do tipo selecionado (O(1))."""
+        self.pages.setCurrentIndex(index)
     
     def get_action(self) -> MacroAction | None:
         """Retorna a ação criada."""
@@ -187,45 +222,41 @@ class AddActionDialog(QDialog):
                 return None
             return MacroAction(
                 action_type=ActionType.KEY_PRESS,
-                data={"key": key},
+                key=key,
                 delay_before=delay
             )
         
         elif index == 1:  # Key release
-            key = self.key_edit.text().strip()
+            key = self._key_release_edit.text().strip()
             if not key:
                 return None
             return MacroAction(
                 action_type=ActionType.KEY_RELEASE,
-                data={"key": key},
+                key=key,
                 delay_before=delay
             )
         
         elif index == 2:  # Mouse click
             return MacroAction(
                 action_type=ActionType.MOUSE_CLICK,
-                data={
-                    "x": self.x_spin.value(),
-                    "y": self.y_spin.value(),
-                    "button": self.button_combo.currentText()
-                },
+                x=self.x_spin.value(),
+                y=self.y_spin.value(),
+                button=self.button_combo.currentText(),
                 delay_before=delay
             )
         
         elif index == 3:  # Mouse move
             return MacroAction(
                 action_type=ActionType.MOUSE_MOVE,
-                data={
-                    "x": self.x_spin.value(),
-                    "y": self.y_spin.value()
-                },
+                x=self._move_x_spin.value(),
+                y=self._move_y_spin.value(),
                 delay_before=delay
             )
         
         elif index == 4:  # Delay
             return MacroAction(
                 action_type=ActionType.DELAY,
-                data={"ms": self.delay_ms_spin.value()},
+                ms=self.delay_ms_spin.value(),
                 delay_before=delay
             )
         
@@ -254,6 +285,16 @@ class MacroEditorWidget(QWidget):
         self.title_label.setObjectName("sectionLabel")
         layout.addWidget(self.title_label)
         
+        # Container único com tudo que é editável: ativar/desativar o
+        # editor vira um setEnabled só (o Qt propaga aos filhos) em vez
+        # de dez invalidações de estilo individuais
+        self._editable = QWidget()
+        editable_layout = QVBoxLayout(self._editable)
+        editable_layout.setContentsMargins(0, 0, 0, 0)
+        editable_layout.setSpacing(16)
+        layout.addWidget(self._editable, 1)
+        layout = editable_layout
+        
         # Informações básicas
         info_group = QGroupBox("Informações")
         info_layout = QFormLayout(info_group)
@@ -319,6 +360,9 @@ class MacroEditorWidget(QWidget):
         actions_layout.addLayout(actions_toolbar)
         
         self.actions_list = QListWidget()
+        # Linhas de ação têm uma linha de texto cada: altura uniforme
+        # dispensa o sizeHint por item no scroll/resize
+        self.actions_list.setUniformItemSizes(True)
         actions_layout.addWidget(self.actions_list)
         
         layout.addWidget(actions_group, 1)
@@ -343,18 +387,8 @@ class MacroEditorWidget(QWidget):
         self.set_enabled(False)
     
     def set_enabled(self, enabled: bool) -> None:
-        """Ativa/desativa o editor."""
-        self.name_edit.setEnabled(enabled)
-        self.hotkey_edit.setEnabled(enabled)
-        self.loop_count_spin.setEnabled(enabled)
-        self.loop_delay_spin.setEnabled(enabled)
-        self.actions_list.setEnabled(enabled)
-        self.btn_add_action.setEnabled(enabled)
-        self.btn_remove_action.setEnabled(enabled)
-        self.btn_move_up.setEnabled(enabled)
-        self.btn_move_down.setEnabled(enabled)
-        self.btn_test.setEnabled(enabled)
-        self.btn_save.setEnabled(enabled)
+        """Ativa/desativa o editor (propagado pelo container)."""
+        self._editable.setEnabled(enabled)
     
     def load_macro(self, macro: Macro) -> None:
         """Carrega uma macro para edição."""
@@ -365,7 +399,7 @@ class MacroEditorWidget(QWidget):
         self.loop_count_spin.setValue(macro.loop_count)
         self.loop_delay_spin.setValue(int(macro.loop_delay))
         
-        self._refresh_actions_list()
+        self._sync_actions_list()
         self.set_enabled(True)
         self.title_label.setText(f"📝 Editando: {macro.name}")
     
@@ -380,17 +414,50 @@ class MacroEditorWidget(QWidget):
         self.set_enabled(False)
         self.title_label.setText("📝 Editor de Macro")
     
-    def _refresh_actions_list(self) -> None:
-        """Atualiza a lista de ações."""
-        self.actions_list.clear()
-        
+    def _sync_actions_list(self) -> None:
+        """
+        Sincroniza a lista visual com as ações da macro.
+
+        Em vez de clear() + recriar um item por ação (reset do model e
+        repaint O(N) a cada edição), reconcilia: remove os itens
+        excedentes, religa os que apontam para a ação errada e anexa
+        apenas o que falta.
+        """
+        actions = self._current_macro.actions if self._current_macro else []
+        lst = self.actions_list
+        
+        # Suspende pinturas e sinais durante a reconciliação: um
+        # repaint no final em vez de um por linha alterada
+        lst.setUpdatesEnabled(False)
+        lst.blockSignals(True)
+        try:
+            while lst.count() > len(actions):
+                lst.takeItem(lst.count() - 1)
+            
+            for i, action in enumerate(actions):
+                item = lst.item(i)
+                if item is None:
+                    lst.addItem(ActionListItem(action, i))
+                elif item.action is not action or item.index != i:
+                    item.action = action
+                    item.index = i
+                    item.update_display()
+        finally:
+            lst.blockSignals(False)
+            lst.setUpdatesEnabled(True)
+    
+    def _renumber_from(self, start: int) -> None:
+        """Reindexa os itens a partir de `start` (após remoção)."""
         if not self._current_macro:
             return
-        
-        for i, action in enumerate(self._current_macro.actions):
-            item = ActionListItem(action, i)
-            self.actions_list.addItem(item)
+        actions = self._current_macro.actions
+        for i in range(start, self.actions_list.count()):
+            item = self.actions_list.item(i)
+            item.action = actions[i]
+            item.index = i
+            item.update_display()
     
+    @pyqtSlot()
     def _add_action(self) -> None:
         """Adiciona uma nova ação."""
         if not self._current_macro:
@@ -401,8 +468,11 @@ class MacroEditorWidget(QWidget):
             action = dialog.get_action()
             if action:
                 self._current_macro.add_action(action)
-                self._refresh_actions_list()
+                # Só o item novo; o resto da lista não muda
+                self.actions_list.addItem(
+                    ActionListItem(action, self.actions_list.count()))
     
+    @pyqtSlot()
     def _remove_action(self) -> None:
         """Remove a ação selecionada."""
         if not self._current_macro:
@@ -410,32 +480,51 @@ class MacroEditorWidget(QWidget):
         
         current = self.actions_list.currentItem()
         if isinstance(current, ActionListItem):
-            self._current_macro.remove_action(current.index)
-            self._refresh_actions_list()
+            row = current.index
+            self._current_macro.remove_action(row)
+            self.actions_list.takeItem(row)
+            # Apenas os itens seguintes mudam de número
+            self._renumber_from(row)
     
+    @pyqtSlot()
     def _move_action_up(self) -> None:
         """Move a ação selecionada para cima."""
-        if not self._current_macro:
-            return
-        
-        current = self.actions_list.currentItem()
-        if isinstance(current, ActionListItem) and current.index > 0:
-            self._current_macro.move_action(current.index, current.index - 1)
-            self._refresh_actions_list()
-            self.actions_list.setCurrentRow(current.index - 1)
+        self._move_action(-1)
     
+    @pyqtSlot()
     def _move_action_down(self) -> None:
         """Move a ação selecionada para baixo."""
+        self._move_action(+1)
+    
+    def _move_action(self, offset: int) -> None:
+        """Move a ação selecionada, mexendo só nas duas linhas trocadas."""
         if not self._current_macro:
             return
         
         current = self.actions_list.currentItem()
-        if isinstance(current, ActionListItem):
-            if current.index < len(self._current_macro.actions) - 1:
-                self._current_macro.move_action(current.index, current.index + 1)
-                self._refresh_actions_list()
-                self.actions_list.setCurrentRow(current.index + 1)
+        if not isinstance(current, ActionListItem):
+            return
+        
+        row = current.index
+        new_row = row + offset
+        if not 0 <= new_row < len(self._current_macro.actions):
+            return
+        
+        self._current_macro.move_action(row, new_row)
+        
+        item = self.actions_list.takeItem(row)
+        self.actions_list.insertItem(new_row, item)
+        
+        # Reindexa apenas as duas linhas afetadas
+        for i in (min(row, new_row), max(row, new_row)):
+            moved = self.actions_list.item(i)
+            moved.action = self._current_macro.actions[i]
+            moved.index = i
+            moved.update_display()
+        
+        self.actions_list.setCurrentItem(item)
     
+    @pyqtSlot()
     def _save_macro(self) -> None:
         """Salva as alterações na macro."""
         if not self._current_macro:
@@ -450,10 +539,12 @@ class MacroEditorWidget(QWidget):
         self._current_macro.hotkey = self.hotkey_edit.text()
         self._current_macro.loop_count = self.loop_count_spin.value()
         self._current_macro.loop_delay = self.loop_delay_spin.value()
+        self._current_macro.bump_version()
         
         self.macro_saved.emit(self._current_macro)
         self.title_label.setText(f"📝 Editando: {name}")
     
+    @pyqtSlot()
     def _test_macro(self) -> None:
         """Testa a macro atual."""
         if self._current_macro:
@@ -6,7 +6,7 @@ from PyQt6.QtWidgets import (
     QPushButton, QLabel, QMenu, QMessageBox, QLineEdit,
     QFrame
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QPoint, QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtGui import QIcon, QAction
 
 from ..core.macro import Macro
@@ -19,16 +19,21 @@ class MacroListItem(QListWidgetItem):
     def __init__(self, macro: Macro):
         super().__init__()
         self.macro = macro
+        self._rendered_version = -1
         self.update_display()
     
     def update_display(self) -> None:
-        """Atualiza o texto exibido."""
+        """Atualiza o texto exibido (no-op se a versão não mudou)."""
+        if self._rendered_version == self.macro._version:
+            return
+        
         status = "🟢" if self.macro.enabled else "🔴"
         hotkey = f"[{self.macro.hotkey}]" if self.macro.hotkey else ""
         actions_count = len(self.macro.actions)
         
         self.setText(f"{status} {self.macro.name} {hotkey}\n"
                     f"    {actions_count} ações")
+        self._rendered_version = self.macro._version
 
 
 class MacroListWidget(QWidget):
@@ -46,6 +51,14 @@ class MacroListWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._macros: list[Macro] = []
+        # (nome, hotkey) em minúsculas por id, para o filtro de busca
+        # não alocar strings novas a cada refresh
+        self._lower_cache: dict[str, tuple[str, str]] = {}
+        # Item visual por id, para seleção O(1)
+        self._items_by_id: dict[str, MacroListItem] = {}
+        # Última macro emitida em macro_selected, para não recarregar o
+        # editor quando a seleção não mudou de fato
+        self._last_selected_id: str | None = None
         self._setup_ui()
     
     def _setup_ui(self) -> None:
@@ -59,23 +72,29 @@ class MacroListWidget(QWidget):
         title.setObjectName("sectionLabel")
         layout.addWidget(title)
         
-        # Barra de busca
+        # Barra de busca (debounce: o filtro roda uma vez quando o
+        # usuário pausa de digitar, não uma por tecla)
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText("🔍 Buscar macros...")
-        self.search_box.textChanged.connect(self._filter_macros)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(200)
+        self._filter_timer.timeout.connect(self._refresh_list)
+        self.search_box.textChanged.connect(self._filter_timer.start)
         layout.addWidget(self.search_box)
         
         # Botões de ação
         button_layout = QHBoxLayout()
         button_layout.setSpacing(8)
         
+        # Conexão sinal-a-sinal: sem trampolim Python por clique
         self.btn_new = QPushButton("➕ Nova")
         self.btn_new.setObjectName("primaryButton")
-        self.btn_new.clicked.connect(lambda: self.new_macro_requested.emit())
+        self.btn_new.clicked.connect(self.new_macro_requested)
         button_layout.addWidget(self.btn_new)
         
         self.btn_record = QPushButton("⏺️ Gravar")
-        self.btn_record.clicked.connect(lambda: self.record_macro_requested.emit())
+        self.btn_record.clicked.connect(self.record_macro_requested)
         button_layout.addWidget(self.btn_record)
         
         layout.addLayout(button_layout)
@@ -83,7 +102,10 @@ class MacroListWidget(QWidget):
         # Lista de macros
         self.list_widget = QListWidget()
         self.list_widget.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
-        self.list_widget.itemClicked.connect(self._on_item_clicked)
+        # Itens sempre têm duas linhas (hotkey vazia vira string vazia,
+        # não some), então o layout pode assumir altura uniforme
+        self.list_widget.setUniformItemSizes(True)
+        self.list_widget.currentItemChanged.connect(self._on_current_changed)
         self.list_widget.itemDoubleClicked.connect(self._on_item_double_clicked)
         self.list_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.list_widget.customContextMenuRequested.connect(self._show_context_menu)
@@ -93,31 +115,63 @@ class MacroListWidget(QWidget):
         self.status_label = QLabel("0 macros")
         self.status_label.setObjectName("subtitleLabel")
         layout.addWidget(self.status_label)
+        
+        # Menu de contexto construído uma única vez; cada clique só
+        # re-aponta as ações para a macro alvo
+        self._context_menu = QMenu(self)
+        
+        self._play_action = self._context_menu.addAction("▶️ Executar")
+        self._play_action.triggered.connect(self._on_play_action)
+        
+        self._context_menu.addSeparator()
+        
+        self._duplicate_action = self._context_menu.addAction("📋 Duplicar")
+        self._duplicate_action.triggered.connect(self._on_duplicate_action)
+        
+        self._context_menu.addSeparator()
+        
+        self._delete_action = self._context_menu.addAction("🗑️ Excluir")
+        self._delete_action.triggered.connect(self._on_delete_action)
     
     def set_macros(self, macros: list[Macro]) -> None:
         """Define a lista de macros."""
         self._macros = macros
+        self._lower_cache = {m.id: (m.name.lower(), m.hotkey.lower())
+                             for m in macros}
         self._refresh_list()
     
     def add_macro(self, macro: Macro) -> None:
         """Adiciona uma macro à lista."""
         self._macros.append(macro)
+        self._lower_cache[macro.id] = (macro.name.lower(),
+                                       macro.hotkey.lower())
         self._refresh_list()
         # Seleciona a nova macro
         self._select_macro_by_id(macro.id)
     
+    def add_macros(self, macros: list[Macro]) -> None:
+        """Adiciona várias macros com um único refresh visual."""
+        self._macros.extend(macros)
+        for macro in macros:
+            self._lower_cache[macro.id] = (macro.name.lower(),
+                                           macro.hotkey.lower())
+        self._refresh_list()
+    
     def update_macro(self, macro: Macro) -> None:
         """Atualiza uma macro na lista."""
         for i, m in enumerate(self._macros):
             if m.id == macro.id:
                 self._macros[i] = macro
                 break
+        self._lower_cache[macro.id] = (macro.name.lower(),
+                                       macro.hotkey.lower())
         self._refresh_list()
         self._select_macro_by_id(macro.id)
     
     def remove_macro(self, macro_id: str) -> None:
         """Remove uma macro da lista."""
         self._macros = [m for m in self._macros if m.id != macro_id]
+        self._lower_cache.pop(macro_id, None)
         self._refresh_list()
     
     def get_selected_macro(self) -> Macro | None:
@@ -129,67 +183,97 @@ class MacroListWidget(QWidget):
     
     def _refresh_list(self) -> None:
         """Atualiza a lista visual."""
-        self.list_widget.clear()
+        w = self.list_widget
         
-        for macro in self._macros:
-            if self._matches_filter(macro):
-                item = MacroListItem(macro)
-                self.list_widget.addItem(item)
+        # Suspende pinturas e sinais durante a reconstrução: um repaint
+        # no final em vez de um por item
+        w.setUpdatesEnabled(False)
+        w.blockSignals(True)
+        try:
+            w.clear()
+            self._items_by_id.clear()
+            
+            # Texto do filtro computado uma vez, fora do loop
+            filter_text = self.search_box.text().strip().lower()
+            
+            for macro in self._macros:
+                if self._matches_filter(macro, filter_text):
+                    item = MacroListItem(macro)
+                    w.addItem(item)
+                    self._items_by_id[macro.id] = item
+        finally:
+            w.blockSignals(False)
+            w.setUpdatesEnabled(True)
         
         self.status_label.setText(f"{len(self._macros)} macros")
     
-    def _matches_filter(self, macro: Macro) -> bool:
+    def _matches_filter(self, macro: Macro, filter_text: str) -> bool:
         """Verifica se a macro corresponde ao filtro de busca."""
-        filter_text = self.search_box.text().lower().strip()
         if not filter_text:
             return True
-        return (filter_text in macro.name.lower() or 
-                filter_text in macro.hotkey.lower())
-    
-    def _filter_macros(self) -> None:
-        """Filtra as macros com base no texto de busca."""
-        self._refresh_list()
+        cached = self._lower_cache.get(macro.id)
+        if cached is None:
+            cached = (macro.name.lower(), macro.hotkey.lower())
+            self._lower_cache[macro.id] = cached
+        return filter_text in cached[0] or filter_text in cached[1]
     
     def _select_macro_by_id(self, macro_id: str) -> None:
-        """Seleciona uma macro pelo ID."""
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if isinstance(item, MacroListItem) and item.macro.id == macro_id:
-                self.list_widget.setCurrentItem(item)
-                break
+        """Seleciona uma macro pelo ID (lookup direto no índice)."""
+        item = self._items_by_id.get(macro_id)
+        if item is not None:
+            self.list_widget.setCurrentItem(item)
     
-    def _on_item_clicked(self, item: QListWidgetItem) -> None:
-        """Callback quando um item é clicado."""
-        if isinstance(item, MacroListItem):
-            self.macro_selected.emit(item.macro)
+    @pyqtSlot(QListWidgetItem, QListWidgetItem)
+    def _on_current_changed(self, current: QListWidgetItem,
+                            previous: QListWidgetItem) -> None:
+        """
+        Callback quando a seleção muda.
+
+        currentItemChanged (em vez de itemClicked) não dispara em
+        re-cliques no item já selecionado, e o id guardado filtra as
+        re-seleções programáticas após um refresh — cada emissão
+        dispararia um reload completo do editor.
+        """
+        if not isinstance(current, MacroListItem):
+            return
+        if current.macro.id == self._last_selected_id:
+            return
+        self._last_selected_id = current.macro.id
+        self.macro_selected.emit(current.macro)
     
+    @pyqtSlot(QListWidgetItem)
     def _on_item_double_clicked(self, item: QListWidgetItem) -> None:
         """Callback quando um item é duplo-clicado."""
         if isinstance(item, MacroListItem):
             self.macro_double_clicked.emit(item.macro)
     
-    def _show_context_menu(self, pos) -> None:
+    @pyqtSlot(QPoint)
+    def _show_context_menu(self, pos: QPoint) -> None:
         """Exibe menu de contexto."""
         item = self.list_widget.itemAt(pos)
         if not isinstance(item, MacroListItem):
             return
         
+        # A macro vai no data() das QActions persistentes: sem lambdas
+        # capturando referências nem menu novo por clique
         macro = item.macro
-        menu = QMenu(self)
-        
-        play_action = menu.addAction("▶️ Executar")
-        play_action.triggered.connect(lambda: self.play_macro_requested.emit(macro))
-        
-        menu.addSeparator()
+        self._play_action.setData(macro)
+        self._duplicate_action.setData(macro)
+        self._delete_action.setData(macro)
         
-        duplicate_action = menu.addAction("📋 Duplicar")
-        duplicate_action.triggered.connect(
-            lambda: self.duplicate_macro_requested.emit(macro))
-        
-        menu.addSeparator()
-        
-        delete_action = menu.addAction("🗑️ Excluir")
-        delete_action.triggered.connect(
-            lambda: self.delete_macro_requested.emit(macro))
-        
-        menu.exec(self.list_widget.mapToGlobal(pos))
+        self._context_menu.exec(self.list_widget.mapToGlobal(pos))
+    
+    @pyqtSlot()
+    def _on_play_action(self) -> None:
+        """Repassa a macro da ação de menu para o sinal de execução."""
+        self.play_macro_requested.emit(self.sender().data())
+    
+    @pyqtSlot()
+    def _on_duplicate_action(self) -> None:
+        """Repassa a macro da ação de menu para o sinal de duplicação."""
+        self.duplicate_macro_requested.emit(self.sender().data())
+    
+    @pyqtSlot()
+    def _on_delete_action(self) -> None:
+        """Repassa a macro da ação de menu para o sinal de exclusão."""
+        self.delete_macro_requested.emit(self.sender().data())
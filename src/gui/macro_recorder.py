@@ -1,21 +1,35 @@
 """
 Widget de gravação de macros.
 """
-import keyboard
+import sys
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
     QCheckBox, QProgressBar, QFrame, QDialog, QSpinBox
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtGui import QShortcut, QKeySequence
 
 from ..core.macro import Macro, MacroAction
 from ..core.recorder import MacroRecorder
 
+# Strings da contagem pré-renderizadas (o spin limita a 0-10)
+_COUNTDOWN_STRS = tuple(str(i) for i in range(11))
+
+if sys.platform == "win32":
+    import ctypes
+    _winmm = ctypes.windll.winmm
+else:
+    _winmm = None
+
 
 class MacroRecorderDialog(QDialog):
     """Diálogo de gravação de macro."""
     
     recording_finished = pyqtSignal(Macro)
+    # Emitido pela thread do listener a cada ação gravada; a conexão
+    # enfileirada devolve o processamento à thread da GUI
+    action_recorded = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -25,8 +39,11 @@ class MacroRecorderDialog(QDialog):
         
         self._recorder = MacroRecorder()
         self._recorder.on_action_recorded = self._on_action_recorded
+        self.action_recorded.connect(self._on_action_recorded_ui,
+                                     Qt.ConnectionType.QueuedConnection)
         self._action_count = 0
         self._countdown_value = 3
+        self._timer_period_active = False
         
         self._setup_ui()
     
@@ -73,8 +90,11 @@ class MacroRecorderDialog(QDialog):
         # Display da contagem regressiva (grande, no centro)
         self.countdown_display = QLabel("")
         self.countdown_display.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # monospace: a troca de 10 para 9 não muda a largura do texto
+        # e não invalida o layout do diálogo a cada tick
         self.countdown_display.setStyleSheet(
-            "font-size: 72px; font-weight: bold; color: #e94560;"
+            "font-size: 72px; font-weight: bold; color: #e94560; "
+            "font-family: monospace;"
         )
         self.countdown_display.hide()
         layout.addWidget(self.countdown_display)
@@ -114,14 +134,59 @@ class MacroRecorderDialog(QDialog):
         
         layout.addLayout(buttons_layout)
         
-        # Timers
+        # Timers (PreciseTimer: o CoarseTimer padrão tolera ~5% de
+        # drift, visível tanto na contagem quanto na cadência do blink)
         self._blink_timer = QTimer(self)
+        self._blink_timer.setTimerType(Qt.TimerType.PreciseTimer)
         self._blink_timer.timeout.connect(self._blink_indicator)
         self._blink_visible = True
         
         self._countdown_timer = QTimer(self)
+        self._countdown_timer.setTimerType(Qt.TimerType.PreciseTimer)
         self._countdown_timer.timeout.connect(self._countdown_tick)
+        
+        # Coalescência do contador: gravando movimento do mouse chegam
+        # centenas de eventos/s, e um setText por evento vira layout +
+        # repaint por evento; este timer limita a ~20 atualizações/s
+        self._counter_flush_timer = QTimer(self)
+        self._counter_flush_timer.setSingleShot(True)
+        self._counter_flush_timer.setInterval(50)
+        self._counter_flush_timer.timeout.connect(self._flush_counter)
+        
+        # F10 para parar: atalho nativo do Qt, registrado uma vez. O
+        # diálogo é modal (tem o foco do teclado), então não precisa do
+        # hook global do `keyboard` — que instalava/removia um hook do
+        # SO a cada gravação e saltava de thread via singleShot
+        self._stop_shortcut = QShortcut(QKeySequence(Qt.Key.Key_F10), self)
+        self._stop_shortcut.setContext(Qt.ShortcutContext.ApplicationShortcut)
+        self._stop_shortcut.activated.connect(self._stop_recording)
+        # Habilitado só com o diálogo visível (show/hideEvent): o
+        # escopo de aplicação em uma instância cacheada engoliria o
+        # F10 do app inteiro para sempre
+        self._stop_shortcut.setEnabled(False)
     
+    def reset(self) -> None:
+        """Restaura o estado ocioso do diálogo.
+
+        Fechar pelo X no meio da contagem/gravação não passa por
+        _stop_recording: sem isto, a instância cacheada reabriria com
+        Iniciar desabilitado, o indicador piscando e o blink timer
+        disparando a cada 500 ms no diálogo escondido.
+        """
+        self._blink_timer.stop()
+        self._countdown_timer.stop()
+        self._counter_flush_timer.stop()
+        self.countdown_display.hide()
+        self.recording_indicator.hide()
+        self.btn_start.setEnabled(True)
+        self.btn_stop.setEnabled(False)
+        self.record_movement_check.setEnabled(True)
+        self.record_release_check.setEnabled(True)
+        self.countdown_spin.setEnabled(True)
+        self._action_count = 0
+        self.counter_label.setText("0 ações gravadas")
+        self.status_label.setText("Pronto para gravar")
+
     def _start_countdown(self) -> None:
         """Inicia a contagem regressiva antes de gravar."""
         countdown_seconds = self.countdown_spin.value()
@@ -144,7 +209,7 @@ class MacroRecorderDialog(QDialog):
         self.countdown_spin.setEnabled(False)
         
         # Mostra contagem
-        self.countdown_display.setText(str(self._countdown_value))
+        self.countdown_display.setText(_COUNTDOWN_STRS[self._countdown_value])
         self.countdown_display.show()
         self.status_label.setText("Preparando...")
         
@@ -156,12 +221,13 @@ class MacroRecorderDialog(QDialog):
         self._countdown_value -= 1
         
         if self._countdown_value > 0:
-            self.countdown_display.setText(str(self._countdown_value))
+            self.countdown_display.setText(_COUNTDOWN_STRS[self._countdown_value])
         else:
             # Contagem terminou, inicia gravação
             self._countdown_timer.stop()
             self.countdown_display.setText("🎬")
-            QTimer.singleShot(300, self._finish_countdown)
+            QTimer.singleShot(300, Qt.TimerType.PreciseTimer,
+                              self._finish_countdown)
     
     def _finish_countdown(self) -> None:
         """Finaliza a contagem e inicia a gravação."""
@@ -177,12 +243,6 @@ class MacroRecorderDialog(QDialog):
         self._recorder.record_mouse_movement = self.record_movement_check.isChecked()
         self._recorder.record_key_release = self.record_release_check.isChecked()
         
-        # Registra hotkey global para parar (F10)
-        try:
-            keyboard.add_hotkey('f10', self._on_stop_hotkey, suppress=True)
-        except Exception:
-            pass  # Ignora se não conseguir registrar
-        
         # Inicia
         self._recorder.start()
         
@@ -196,19 +256,8 @@ class MacroRecorderDialog(QDialog):
         self.recording_indicator.show()
         self._blink_timer.start(500)
     
-    def _on_stop_hotkey(self) -> None:
-        """Callback quando a hotkey de parar é pressionada."""
-        # Usa QTimer para chamar no thread principal
-        QTimer.singleShot(0, self._stop_recording)
-    
     def _stop_recording(self) -> None:
         """Para a gravação."""
-        # Remove hotkey global
-        try:
-            keyboard.remove_hotkey('f10')
-        except Exception:
-            pass  # Ignora se não estava registrada
-        
         # Para timers
         self._blink_timer.stop()
         self._countdown_timer.stop()
@@ -227,6 +276,10 @@ class MacroRecorderDialog(QDialog):
         
         actions = self._recorder.stop()
         
+        # Última contagem pendente, para o total final aparecer certo
+        self._counter_flush_timer.stop()
+        self._flush_counter()
+        
         # Atualiza UI
         self.btn_start.setEnabled(True)
         self.btn_stop.setEnabled(False)
@@ -245,8 +298,21 @@ class MacroRecorderDialog(QDialog):
             self.status_label.setText("Nenhuma ação gravada")
     
     def _on_action_recorded(self, action: MacroAction) -> None:
-        """Callback quando uma ação é gravada."""
+        """Callback do gravador (roda na thread do listener).
+
+        Tocar em widgets ou QTimers fora da thread da GUI é indefinido
+        no Qt; daqui só sai a emissão do sinal enfileirado.
+        """
+        self.action_recorded.emit()
+    
+    def _on_action_recorded_ui(self) -> None:
+        """Contabiliza a ação já na thread da GUI."""
         self._action_count += 1
+        if not self._counter_flush_timer.isActive():
+            self._counter_flush_timer.start()
+    
+    def _flush_counter(self) -> None:
+        """Renderiza o contador acumulado desde o último flush."""
         self.counter_label.setText(f"{self._action_count} ações gravadas")
     
     def _blink_indicator(self) -> None:
@@ -254,6 +320,30 @@ class MacroRecorderDialog(QDialog):
         self._blink_visible = not self._blink_visible
         self.recording_indicator.setVisible(self._blink_visible)
     
+    def showEvent(self, event):
+        """Eleva a resolução do timer do SO enquanto o diálogo está aberto."""
+        # Mesmo com PreciseTimer, o tick do Windows fica em 15.6 ms até
+        # alguém pedir 1 ms; escopo limitado ao diálogo para não drenar
+        # bateria com o app ocioso
+        if _winmm is not None and not self._timer_period_active:
+            _winmm.timeBeginPeriod(1)
+            self._timer_period_active = True
+        self._stop_shortcut.setEnabled(True)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Devolve a resolução padrão do timer ao esconder o diálogo.
+
+        Par do showEvent: dispara tanto no fechar quanto no accept()
+        (que esconde sem passar pelo closeEvent), então o período de
+        1 ms nunca vaza com o diálogo cacheado fora de tela.
+        """
+        if self._timer_period_active:
+            _winmm.timeEndPeriod(1)
+            self._timer_period_active = False
+        self._stop_shortcut.setEnabled(False)
+        super().hideEvent(event)
+
     def keyPressEvent(self, event):
         """Captura ESC para parar gravação."""
         if event.key() == Qt.Key.Key_Escape:
@@ -263,15 +353,9 @@ class MacroRecorderDialog(QDialog):
             super().keyPressEvent(event)
     
     def closeEvent(self, event):
-        """Garante que a gravação para ao fechar."""
-        # Remove hotkey global
-        try:
-            keyboard.remove_hotkey('f10')
-        except Exception:
-            pass
-        
-        self._countdown_timer.stop()
+        """Garante que a gravação para e o estado volta ao ocioso."""
         if self._recorder.is_recording:
             self._recorder.stop()
+        self.reset()
         super().closeEvent(event)
 
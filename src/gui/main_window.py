@@ -1,17 +1,19 @@
 """
 Janela principal do MacroWing.
 """
-import json
+import functools
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QStatusBar, QMenuBar, QMenu, QMessageBox, QFileDialog,
     QLabel, QApplication
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import (
+    Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+)
 from PyQt6.QtGui import QAction, QCloseEvent
 
-from .styles import DARK_THEME, COLORS
+from .styles import COLORS
 from .macro_list import MacroListWidget
 from .macro_editor import MacroEditorWidget
 from .macro_recorder import MacroRecorderDialog
@@ -22,8 +24,39 @@ from ..core.macro import Macro
 from ..core.storage import MacroStorage
 from ..core.player import MacroPlayer, EasingType
 from ..core.hotkey_manager import HotkeyManager
+from ..utils import jsonio
 from ..utils.helpers import get_settings_file
 
+# Índice do combo de easing -> EasingType (compartilhado entre o load
+# das configurações e o apply do diálogo)
+_EASING_MAP = (
+    EasingType.LINEAR,
+    EasingType.EASE_OUT_QUAD,
+    EasingType.EASE_OUT_CUBIC,
+    EasingType.EASE_OUT_EXPO,
+    EasingType.EASE_IN_OUT,
+)
+
+
+class _LoadMacrosTask(QRunnable):
+    """Carrega as macros do disco em uma thread do pool.
+
+    O sinal (hospedado em um QObject próprio, já que QRunnable não emite
+    sinais) chega à GUI via conexão enfileirada, então os updates de
+    widget rodam na thread certa.
+    """
+
+    class _Signals(QObject):
+        loaded = pyqtSignal(list)
+
+    def __init__(self, storage: MacroStorage):
+        super().__init__()
+        self.signals = self._Signals()
+        self._storage = storage
+
+    def run(self) -> None:
+        self.signals.loaded.emit(self._storage.load_all())
+
 
 class MainWindow(QMainWindow):
     """Janela principal da aplicação."""
@@ -38,8 +71,32 @@ class MainWindow(QMainWindow):
         
         # Dados
         self._macros: list[Macro] = []
+        # O load inicial roda em uma thread do pool; até ele aplicar,
+        # self._macros é só o estado parcial em memória
+        self._macros_loaded = False
+        # Índice por id: toggles via hotkey/bandeja e saves do editor
+        # são O(1) em vez de varrer a lista
+        self._macros_by_id: dict[str, Macro] = {}
         self._settings: dict = {}
         
+        # Diálogos cacheados (construídos no primeiro uso)
+        self._recorder_dialog: MacroRecorderDialog | None = None
+        self._settings_dialog: SettingsDialog | None = None
+        
+        # Debounce dos saves: edições em sequência colapsam em um único
+        # repasse ao storage (e uma reconstrução do menu da bandeja)
+        self._save_pending_timer = QTimer(self)
+        self._save_pending_timer.setSingleShot(True)
+        self._save_pending_timer.setInterval(500)
+        self._save_pending_timer.timeout.connect(self._do_save_macros)
+        
+        # Mesmo padrão para o settings.json: aplicar várias vezes em
+        # sequência gera uma gravação só
+        self._settings_save_timer = QTimer(self)
+        self._settings_save_timer.setSingleShot(True)
+        self._settings_save_timer.setInterval(300)
+        self._settings_save_timer.timeout.connect(self._save_settings)
+        
         # UI
         self._setup_window()
         self._setup_menu()
@@ -48,22 +105,17 @@ class MainWindow(QMainWindow):
         self._setup_tray()
         self._setup_callbacks()
         
-        # Carrega dados
-        self._load_settings()
-        self._load_macros()
-        
-        # Inicia hotkeys
-        self._hotkey_manager.start()
-        self._register_hotkeys()
+        # Carga de dados e registro de hotkeys fora do caminho crítico:
+        # a janela pinta primeiro e o singleShot(0) roda na volta do
+        # event loop (o registro global de hotkeys é o passo mais lento)
+        self._update_status("Carregando...")
+        QTimer.singleShot(0, self._deferred_init)
     
     def _setup_window(self) -> None:
         """Configura a janela."""
         self.setWindowTitle("MacroWing - Gerenciador de Macros")
         self.setMinimumSize(900, 600)
         self.resize(1100, 700)
-        
-        # Aplica tema
-        self.setStyleSheet(DARK_THEME)
     
     def _setup_menu(self) -> None:
         """Configura a barra de menus."""
@@ -210,13 +262,20 @@ class MainWindow(QMainWindow):
     
     # === Carregamento e Salvamento ===
     
+    def _deferred_init(self) -> None:
+        """Continuação da inicialização, após o primeiro paint."""
+        self._load_settings()
+        self._load_macros()
+        self._hotkey_manager.start()
+    
+    
     def _load_settings(self) -> None:
         """Carrega as configurações."""
         settings_file = get_settings_file()
         if settings_file.exists():
             try:
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    self._settings = json.load(f)
+                with open(settings_file, 'rb') as f:
+                    self._settings = jsonio.loads(f.read())
             except Exception:
                 self._settings = {}
         
@@ -240,43 +299,90 @@ class MainWindow(QMainWindow):
         self._player.smooth_mouse_max_duration = self._settings.get("smooth_mouse_max_duration", 800)
         
         easing_index = self._settings.get("smooth_mouse_easing_index", 2)
-        easing_map = {
-            0: EasingType.LINEAR,
-            1: EasingType.EASE_OUT_QUAD,
-            2: EasingType.EASE_OUT_CUBIC,
-            3: EasingType.EASE_OUT_EXPO,
-            4: EasingType.EASE_IN_OUT,
-        }
-        self._player.smooth_mouse_easing = easing_map.get(easing_index, EasingType.EASE_OUT_CUBIC)
+        self._player.smooth_mouse_easing = (
+            _EASING_MAP[easing_index]
+            if 0 <= easing_index < len(_EASING_MAP)
+            else EasingType.EASE_OUT_CUBIC
+        )
     
     def _save_settings(self) -> None:
-        """Salva as configurações."""
-        settings_file = get_settings_file()
-        with open(settings_file, 'w', encoding='utf-8') as f:
-            json.dump(self._settings, f, indent=2)
+        """Salva as configurações (escrita atômica, sem truncar no lugar)."""
+        jsonio.dump_file(self._settings, get_settings_file())
     
     def _load_macros(self) -> None:
-        """Carrega as macros salvas."""
-        self._macros = self._storage.load_all()
-        self._macro_list.set_macros(self._macros)
-        self._tray.update_macros(self._macros)
-        self._update_status(f"{len(self._macros)} macros carregadas")
+        """Dispara o carregamento das macros em uma thread do pool."""
+        task = _LoadMacrosTask(self._storage)
+        task.signals.loaded.connect(self._apply_loaded_macros)
+        QThreadPool.globalInstance().start(task)
+    
+    def _apply_loaded_macros(self, macros: list) -> None:
+        """Aplica as macros carregadas (na thread da GUI)."""
+        # Macros criadas/gravadas/importadas antes do load terminar:
+        # a lista começou vazia, então tudo que já está nela é adição
+        # pendente que não pode ser clobberada pelo conteúdo do disco
+        loaded_ids = {m.id for m in macros}
+        pending = [m for m in self._macros if m.id not in loaded_ids]
+        macros = macros + pending
+
+        self._macros_loaded = True
+        self._macros = macros
+        self._macros_by_id = {m.id: m for m in macros}
+        self._macro_list.set_macros(macros)
+        self._tray.update_macros(macros)
+        self._register_hotkeys()
+        self._update_status(f"{len(macros)} macros carregadas")
+        if pending:
+            self._save_macros()
     
     def _save_macros(self) -> None:
+        """Agenda o salvamento das macros (coalescido em 500 ms)."""
+        self._save_pending_timer.start()
+    
+    def _do_save_macros(self) -> None:
         """Salva todas as macros."""
+        # save_all substitui o cache do storage: antes do load inicial
+        # aplicar, isso (e o load_all em voo) deixaria só o estado
+        # parcial, e o flush regravaria o macros.json sem as macros
+        # antigas. Re-agenda até _apply_loaded_macros rodar.
+        if not self._macros_loaded:
+            self._save_pending_timer.start()
+            return
         self._storage.save_all(self._macros)
         self._tray.update_macros(self._macros)
+
+    def _flush_pending_save(self) -> None:
+        """Executa imediatamente os saves agendados (shutdown/minimizar)."""
+        if self._save_pending_timer.isActive():
+            self._save_pending_timer.stop()
+            if self._macros_loaded:
+                self._do_save_macros()
+        if self._settings_save_timer.isActive():
+            self._settings_save_timer.stop()
+            self._save_settings()
     
     def _register_hotkeys(self) -> None:
-        """Registra hotkeys de todas as macros."""
-        for macro in self._macros:
-            if macro.enabled and macro.hotkey:
-                self._hotkey_manager.bind(
-                    macro.id,
-                    macro.hotkey,
-                    lambda m=macro: self._play_macro(m),
-                    f"Executar: {macro.name}"
-                )
+        """Registra hotkeys de todas as macros em lote."""
+        self._hotkey_manager.load_bindings(
+            (
+                macro.id,
+                macro.hotkey,
+                functools.partial(self._play_macro_by_id, macro.id),
+                f"Executar: {macro.name}"
+            )
+            for macro in self._macros
+            if macro.enabled and macro.hotkey
+        )
+    
+    def _register_hotkey_for(self, macro: Macro) -> None:
+        """Registra (ou re-registra) a hotkey de uma única macro."""
+        self._hotkey_manager.unbind(macro.id)
+        if macro.enabled and macro.hotkey:
+            self._hotkey_manager.bind(
+                macro.id,
+                macro.hotkey,
+                functools.partial(self._play_macro_by_id, macro.id),
+                f"Executar: {macro.name}"
+            )
     
     # === Ações de Macro ===
     
@@ -284,6 +390,7 @@ class MainWindow(QMainWindow):
         """Cria uma nova macro."""
         macro = Macro(name="Nova Macro")
         self._macros.append(macro)
+        self._macros_by_id[macro.id] = macro
         self._macro_list.set_macros(self._macros)  # Atualiza sem duplicar
         self._macro_list._select_macro_by_id(macro.id)
         self._macro_editor.load_macro(macro)
@@ -292,19 +399,27 @@ class MainWindow(QMainWindow):
     
     def _record_macro(self) -> None:
         """Abre o diálogo de gravação."""
-        dialog = MacroRecorderDialog(self)
-        dialog.recording_finished.connect(self._on_recording_finished)
+        # Instância única: a árvore de widgets do diálogo (e o parse do
+        # stylesheet) é construída uma vez, não a cada gravação
+        if self._recorder_dialog is None:
+            self._recorder_dialog = MacroRecorderDialog(self)
+            self._recorder_dialog.recording_finished.connect(
+                self._on_recording_finished)
+        
+        dialog = self._recorder_dialog
+        dialog.reset()
         dialog.exec()
     
     def _on_recording_finished(self, macro: Macro) -> None:
         """Callback quando a gravação termina."""
         # Adiciona na lista principal e na UI (add_macro já adiciona em _macros)
         self._macros.append(macro)
+        self._macros_by_id[macro.id] = macro
         self._macro_list.set_macros(self._macros)  # Atualiza a lista sem duplicar
         self._macro_list._select_macro_by_id(macro.id)
         self._macro_editor.load_macro(macro)
         self._save_macros()
-        self._register_hotkeys()
+        self._register_hotkey_for(macro)
         self._update_status(f"Macro gravada: {len(macro.actions)} ações")
     
     def _play_macro(self, macro: Macro) -> None:
@@ -315,6 +430,12 @@ class MainWindow(QMainWindow):
         
         self._player.play(macro)
     
+    def _play_macro_by_id(self, macro_id: str) -> None:
+        """Executa uma macro pelo id (callback estável para hotkeys)."""
+        macro = self._macros_by_id.get(macro_id)
+        if macro is not None:
+            self._play_macro(macro)
+    
     def _play_selected(self) -> None:
         """Executa a macro selecionada."""
         macro = self._macro_list.get_selected_macro()
@@ -338,6 +459,7 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             self._hotkey_manager.unbind(macro.id)
             self._macros = [m for m in self._macros if m.id != macro.id]
+            self._macros_by_id.pop(macro.id, None)
             self._macro_list.remove_macro(macro.id)
             self._macro_editor.clear()
             self._save_macros()
@@ -353,6 +475,7 @@ class MainWindow(QMainWindow):
         """Duplica uma macro."""
         new_macro = macro.duplicate()
         self._macros.append(new_macro)
+        self._macros_by_id[new_macro.id] = new_macro
         self._macro_list.set_macros(self._macros)  # Atualiza sem duplicar
         self._macro_list._select_macro_by_id(new_macro.id)
         self._macro_editor.load_macro(new_macro)
@@ -367,17 +490,19 @@ class MainWindow(QMainWindow):
     
     def _toggle_macro(self, macro_id: str) -> None:
         """Alterna o estado ativo de uma macro."""
-        for macro in self._macros:
-            if macro.id == macro_id:
-                macro.enabled = not macro.enabled
-                
-                if macro.enabled and macro.hotkey:
-                    self._hotkey_manager.enable_binding(macro_id)
-                else:
-                    self._hotkey_manager.disable_binding(macro_id)
-                
-                self._save_macros()
-                break
+        macro = self._macros_by_id.get(macro_id)
+        if macro is None:
+            return
+        
+        macro.enabled = not macro.enabled
+        macro.bump_version()
+        
+        if macro.enabled and macro.hotkey:
+            self._hotkey_manager.enable_binding(macro_id)
+        else:
+            self._hotkey_manager.disable_binding(macro_id)
+        
+        self._save_macros()
     
     # === Callbacks de UI ===
     
@@ -387,36 +512,32 @@ class MainWindow(QMainWindow):
     
     def _on_macro_saved(self, macro: Macro) -> None:
         """Quando uma macro é salva no editor."""
-        # Atualiza na lista
-        for i, m in enumerate(self._macros):
-            if m.id == macro.id:
-                self._macros[i] = macro
-                break
+        # Atualiza na lista (o índice aponta a posição, sem varredura)
+        existing = self._macros_by_id.get(macro.id)
+        if existing is not None and existing is not macro:
+            self._macros[self._macros.index(existing)] = macro
+        self._macros_by_id[macro.id] = macro
         
         self._macro_list.update_macro(macro)
         self._save_macros()
         
         # Atualiza hotkey
-        self._hotkey_manager.unbind(macro.id)
-        if macro.enabled and macro.hotkey:
-            self._hotkey_manager.bind(
-                macro.id,
-                macro.hotkey,
-                lambda m=macro: self._play_macro(m),
-                f"Executar: {macro.name}"
-            )
+        self._register_hotkey_for(macro)
         
         self._update_status(f"Macro '{macro.name}' salva")
     
     def _on_playback_started(self, macro: Macro) -> None:
         """Quando a reprodução inicia."""
-        self._playing_label.setText(f"▶️ Executando: {macro.name}")
-        self._playing_label.setStyleSheet(f"color: {COLORS['success']};")
+        text = f"▶️ Executando: {macro.name}"
+        if self._playing_label.text() != text:
+            self._playing_label.setText(text)
+            self._playing_label.setStyleSheet(f"color: {COLORS['success']};")
         self._tray.set_playing(True, macro.name)
     
     def _on_playback_stopped(self, macro: Macro) -> None:
         """Quando a reprodução para."""
-        self._playing_label.setText("")
+        if self._playing_label.text():
+            self._playing_label.setText("")
         self._tray.set_playing(False)
     
     # === Import/Export ===
@@ -434,11 +555,14 @@ class MainWindow(QMainWindow):
             try:
                 imported = self._storage.import_macros(Path(file_path))
                 for macro in imported:
-                    self._macros.append(macro)
-                
-                self._macro_list.set_macros(self._macros)  # Atualiza sem duplicar
+                    self._macros_by_id[macro.id] = macro
+                    self._register_hotkey_for(macro)
+
+                # add_macros estende a lista compartilhada (a mesma de
+                # self._macros) e atualiza o cache de busca só com as
+                # novas, em um único refresh visual
+                self._macro_list.add_macros(imported)
                 self._save_macros()
-                self._register_hotkeys()
                 self._update_status(f"{len(imported)} macros importadas")
                 
             except Exception as e:
@@ -469,14 +593,23 @@ class MainWindow(QMainWindow):
     
     def _show_settings(self) -> None:
         """Exibe o diálogo de configurações."""
-        dialog = SettingsDialog(self._settings, self)
-        dialog.settings_changed.connect(self._on_settings_changed)
-        dialog.exec()
+        # Instância única: fechar só esconde o diálogo, então reabrir
+        # não reconstrói os ~30 widgets nem recalcula estilos
+        if self._settings_dialog is None:
+            self._settings_dialog = SettingsDialog(self._settings, self)
+            self._settings_dialog.settings_changed.connect(
+                self._on_settings_changed)
+        else:
+            self._settings_dialog.reload(self._settings)
+        
+        self._settings_dialog.show()
+        self._settings_dialog.raise_()
+        self._settings_dialog.activateWindow()
     
     def _on_settings_changed(self, settings: dict) -> None:
         """Quando as configurações são alteradas."""
         self._settings = settings
-        self._save_settings()
+        self._settings_save_timer.start()
         
         # Aplica configuração de hotkey de pânico
         self._hotkey_manager.panic_key = settings.get("panic_key", "escape")
@@ -489,20 +622,18 @@ class MainWindow(QMainWindow):
         
         # Mapeia índice do combo para EasingType
         easing_index = settings.get("smooth_mouse_easing_index", 2)
-        easing_map = {
-            0: EasingType.LINEAR,
-            1: EasingType.EASE_OUT_QUAD,
-            2: EasingType.EASE_OUT_CUBIC,
-            3: EasingType.EASE_OUT_EXPO,
-            4: EasingType.EASE_IN_OUT,
-        }
-        self._player.smooth_mouse_easing = easing_map.get(easing_index, EasingType.EASE_OUT_CUBIC)
+        self._player.smooth_mouse_easing = (
+            _EASING_MAP[easing_index]
+            if 0 <= easing_index < len(_EASING_MAP)
+            else EasingType.EASE_OUT_CUBIC
+        )
     
     # === Utilitários ===
     
     def _update_status(self, message: str) -> None:
-        """Atualiza a barra de status."""
-        self._status_label.setText(message)
+        """Atualiza a barra de status (sem repaint se o texto é o mesmo)."""
+        if self._status_label.text() != message:
+            self._status_label.setText(message)
     
     def _show_from_tray(self) -> None:
         """Mostra a janela a partir da bandeja."""
@@ -523,6 +654,7 @@ class MainWindow(QMainWindow):
     
     def _quit_app(self) -> None:
         """Encerra a aplicação."""
+        self._flush_pending_save()
         self._hotkey_manager.stop()
         self._player.stop()
         self._tray.hide()
@@ -531,6 +663,7 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event: QCloseEvent) -> None:
         """Evento de fechamento da janela."""
         if self._settings.get("minimize_to_tray", True):
+            self._flush_pending_save()
             event.ignore()
             self.hide()
             self._tray.show_message(
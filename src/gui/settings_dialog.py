@@ -3,64 +3,144 @@ Diálogo de configurações.
 """
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLineEdit, QPushButton, QLabel, QCheckBox, QGroupBox,
+    QPushButton, QLabel, QCheckBox, QGroupBox,
     QTabWidget, QWidget, QDialogButtonBox, QFileDialog,
-    QMessageBox, QSlider, QDoubleSpinBox, QSpinBox, QComboBox
+    QMessageBox, QSlider, QSpinBox, QComboBox
 )
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import (
+    pyqtSignal, Qt, QTimer, QSignalBlocker, QObject, QRunnable,
+    QThreadPool
+)
+
+
+class _ExportTask(QRunnable):
+    """Copia o arquivo de macros em uma thread do pool.
+
+    copyfile (não copy2): o kernel faz a cópia via sendfile/CopyFileEx
+    e o export não precisa replicar timestamps; o sinal enfileirado
+    devolve o resultado à thread da GUI.
+    """
+
+    class _Signals(QObject):
+        finished = pyqtSignal(bool, str)
+
+    def __init__(self, source: str, destination: str):
+        super().__init__()
+        self.signals = self._Signals()
+        self._source = source
+        self._destination = destination
 
-from .macro_editor import HotkeyLineEdit
+    def run(self) -> None:
+        import shutil
+        try:
+            shutil.copyfile(self._source, self._destination)
+        except Exception as e:
+            self.signals.finished.emit(False, str(e))
+        else:
+            self.signals.finished.emit(True, "")
 
 
 class SettingsDialog(QDialog):
     """Diálogo de configurações da aplicação."""
-    
+
     settings_changed = pyqtSignal(dict)
-    
+
     def __init__(self, settings: dict, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Configurações")
         self.setMinimumSize(500, 500)
-        
-        self._settings = settings.copy()
+
+        # dict(): cópia rasa em um construtor C, dona única do estado
+        self._settings = dict(settings)
+
+        # Debounce do Apply: cliques em rajada (ou um futuro
+        # live-preview) colapsam em uma única emissão/gravação
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(300)
+        self._emit_timer.timeout.connect(self._emit_settings)
+
         self._setup_ui()
         self._load_settings()
-    
+
+    def reload(self, settings: dict) -> None:
+        """Recarrega o diálogo com um novo dict de configurações.
+
+        Usado pela janela principal ao reabrir a instância cacheada.
+        """
+        self._settings = dict(settings)
+        self._load_settings()
+
     def _setup_ui(self) -> None:
         layout = QVBoxLayout(self)
+
+        # Tabs: só a "Geral" é construída de imediato; as demais são
+        # placeholders preenchidos na primeira visita (abrir o diálogo
+        # custava os quatro form layouts de uma vez)
+        self.tabs = QTabWidget()
+
+        self.tabs.addTab(self._create_general_tab(), "Geral")
+        self.tabs.addTab(QWidget(), "Movimento")
+        self.tabs.addTab(QWidget(), "Gravação")
+        self.tabs.addTab(QWidget(), "Dados")
+
+        self._tab_builders = {
+            1: self._build_movement_tab,
+            2: self._build_recording_tab,
+            3: self._build_data_tab,
+        }
+        self._built = {0}
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
+
+        layout.addWidget(self.tabs)
+
+        # Botões
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok |
+            QDialogButtonBox.StandardButton.Cancel |
+            QDialogButtonBox.StandardButton.Apply
+        )
+        buttons.accepted.connect(self._save_and_close)
+        buttons.rejected.connect(self.reject)
+        buttons.button(QDialogButtonBox.StandardButton.Apply).clicked.connect(
+            self._apply_settings
+        )
+        layout.addWidget(buttons)
+
+    def _create_general_tab(self) -> QWidget:
+        """Constrói a tab Geral (única montada na abertura)."""
+        # Import aqui: puxar o macro_editor no import do módulo traria
+        # o editor inteiro para a memória mesmo sem abrir configurações
+        from .macro_editor import HotkeyLineEdit
         
-        # Tabs
-        tabs = QTabWidget()
-        
-        # Tab Geral
         general_tab = QWidget()
         general_layout = QVBoxLayout(general_tab)
-        
+
         # Comportamento
         behavior_group = QGroupBox("Comportamento")
         behavior_layout = QFormLayout(behavior_group)
-        
+
         self.start_minimized_check = QCheckBox("Iniciar minimizado na bandeja")
         behavior_layout.addRow(self.start_minimized_check)
-        
+
         self.minimize_to_tray_check = QCheckBox("Minimizar para bandeja ao fechar")
         behavior_layout.addRow(self.minimize_to_tray_check)
-        
+
         self.start_with_windows_check = QCheckBox("Iniciar com o Windows")
         behavior_layout.addRow(self.start_with_windows_check)
-        
+
         general_layout.addWidget(behavior_group)
-        
+
         # Tecla de pânico
         panic_group = QGroupBox("Tecla de Emergência")
         panic_layout = QFormLayout(panic_group)
-        
+
         panic_info = QLabel(
             "Esta tecla para todas as macros em execução imediatamente."
         )
         panic_info.setWordWrap(True)
         panic_layout.addRow(panic_info)
-        
+
         self.panic_key_edit = HotkeyLineEdit()
         panic_key_layout = QHBoxLayout()
         panic_key_layout.addWidget(self.panic_key_edit)
@@ -69,30 +149,38 @@ class SettingsDialog(QDialog):
         clear_btn.clicked.connect(self.panic_key_edit.clear_hotkey)
         panic_key_layout.addWidget(clear_btn)
         panic_layout.addRow("Tecla:", panic_key_layout)
-        
+
         general_layout.addWidget(panic_group)
         general_layout.addStretch()
-        
-        tabs.addTab(general_tab, "Geral")
-        
-        # Tab Movimento do Mouse
-        movement_tab = QWidget()
+
+        return general_tab
+
+    def _ensure_tab_built(self, index: int) -> None:
+        """Constrói o conteúdo da tab na primeira visita."""
+        if index in self._built:
+            return
+        self._built.add(index)
+        self._tab_builders[index]()
+
+    def _build_movement_tab(self) -> None:
+        """Constrói a tab Movimento do Mouse."""
+        movement_tab = self.tabs.widget(1)
         movement_layout = QVBoxLayout(movement_tab)
-        
+
         # Movimento suave
         smooth_group = QGroupBox("Movimento Suave do Mouse")
         smooth_layout = QFormLayout(smooth_group)
-        
+
         smooth_info = QLabel(
             "O movimento suave faz o cursor se mover de forma fluida\n"
             "entre os pontos, imitando o comportamento humano."
         )
         smooth_info.setWordWrap(True)
         smooth_layout.addRow(smooth_info)
-        
+
         self.smooth_enabled_check = QCheckBox("Ativar movimento suave")
         smooth_layout.addRow(self.smooth_enabled_check)
-        
+
         # Tipo de easing
         self.easing_combo = QComboBox()
         self.easing_combo.addItems([
@@ -103,114 +191,123 @@ class SettingsDialog(QDialog):
             "Ease In/Out (suave início e fim)"
         ])
         smooth_layout.addRow("Curva de movimento:", self.easing_combo)
-        
-        # Velocidade
+
+        # Velocidade (label coalescido a ~30 Hz: o arrasto dispara
+        # valueChanged a cada passo inteiro do slider)
         speed_layout = QHBoxLayout()
         self.speed_slider = QSlider(Qt.Orientation.Horizontal)
         self.speed_slider.setRange(1, 30)  # 0.1x a 3.0x
         self.speed_slider.setValue(10)  # 1.0x
-        self.speed_slider.valueChanged.connect(self._update_speed_label)
+        self._speed_timer = QTimer(self)
+        self._speed_timer.setSingleShot(True)
+        self._speed_timer.setInterval(33)
+        self._speed_timer.timeout.connect(self._flush_speed_label)
+        self.speed_slider.valueChanged.connect(self._on_speed_changed)
         speed_layout.addWidget(self.speed_slider)
-        
+
         self.speed_label = QLabel("1.0x")
         self.speed_label.setMinimumWidth(40)
         speed_layout.addWidget(self.speed_label)
         smooth_layout.addRow("Velocidade:", speed_layout)
-        
+
         # Duração mínima
         self.min_duration_spin = QSpinBox()
         self.min_duration_spin.setRange(10, 500)
         self.min_duration_spin.setValue(50)
         self.min_duration_spin.setSuffix(" ms")
         smooth_layout.addRow("Duração mínima:", self.min_duration_spin)
-        
+
         # Duração máxima
         self.max_duration_spin = QSpinBox()
         self.max_duration_spin.setRange(100, 2000)
         self.max_duration_spin.setValue(800)
         self.max_duration_spin.setSuffix(" ms")
         smooth_layout.addRow("Duração máxima:", self.max_duration_spin)
-        
+
         movement_layout.addWidget(smooth_group)
         movement_layout.addStretch()
-        
-        tabs.addTab(movement_tab, "Movimento")
-        
-        # Tab Gravação
-        recording_tab = QWidget()
+
+        self._load_movement_tab()
+
+    def _build_recording_tab(self) -> None:
+        """Constrói a tab Gravação."""
+        recording_tab = self.tabs.widget(2)
         recording_layout = QVBoxLayout(recording_tab)
-        
+
         recording_group = QGroupBox("Opções de Gravação")
         rec_form = QFormLayout(recording_group)
-        
+
         self.default_record_movement = QCheckBox("Gravar movimentos do mouse por padrão")
         rec_form.addRow(self.default_record_movement)
-        
+
         self.default_record_release = QCheckBox("Gravar liberação de teclas por padrão")
         rec_form.addRow(self.default_record_release)
-        
+
         recording_layout.addWidget(recording_group)
         recording_layout.addStretch()
-        
-        tabs.addTab(recording_tab, "Gravação")
-        
-        # Tab Dados
-        data_tab = QWidget()
+
+        self._load_recording_tab()
+
+    def _build_data_tab(self) -> None:
+        """Constrói a tab Dados."""
+        data_tab = self.tabs.widget(3)
         data_layout = QVBoxLayout(data_tab)
-        
+
         data_group = QGroupBox("Gerenciamento de Dados")
         data_form = QVBoxLayout(data_group)
-        
+
         # Localização
         location_layout = QHBoxLayout()
         self.data_location_label = QLabel()
         location_layout.addWidget(self.data_location_label, 1)
-        
+
         open_folder_btn = QPushButton("📁 Abrir Pasta")
         open_folder_btn.clicked.connect(self._open_data_folder)
         location_layout.addWidget(open_folder_btn)
         data_form.addLayout(location_layout)
-        
+
         # Backup
         backup_layout = QHBoxLayout()
-        
-        export_btn = QPushButton("📤 Exportar Todas")
-        export_btn.clicked.connect(self._export_all)
-        backup_layout.addWidget(export_btn)
-        
+
+        self.export_btn = QPushButton("📤 Exportar Todas")
+        self.export_btn.clicked.connect(self._export_all)
+        backup_layout.addWidget(self.export_btn)
+
         import_btn = QPushButton("📥 Importar")
         import_btn.clicked.connect(self._import_macros)
         backup_layout.addWidget(import_btn)
-        
+
         data_form.addLayout(backup_layout)
-        
+
         data_layout.addWidget(data_group)
         data_layout.addStretch()
-        
-        tabs.addTab(data_tab, "Dados")
-        
-        layout.addWidget(tabs)
-        
-        # Botões
-        buttons = QDialogButtonBox(
-            QDialogButtonBox.StandardButton.Ok |
-            QDialogButtonBox.StandardButton.Cancel |
-            QDialogButtonBox.StandardButton.Apply
-        )
-        buttons.accepted.connect(self._save_and_close)
-        buttons.rejected.connect(self.reject)
-        buttons.button(QDialogButtonBox.StandardButton.Apply).clicked.connect(
-            self._apply_settings
-        )
-        layout.addWidget(buttons)
-    
+
+        self._load_data_tab()
+
+    def _on_speed_changed(self, value: int) -> None:
+        """Agenda a atualização do label (um método próprio: conectar
+        valueChanged direto em QTimer.start trocaria o intervalo)."""
+        if not self._speed_timer.isActive():
+            self._speed_timer.start()
+
+    def _flush_speed_label(self) -> None:
+        """Renderiza o valor atual do slider no label."""
+        self._update_speed_label(self.speed_slider.value())
+
     def _update_speed_label(self, value: int) -> None:
         """Atualiza o label de velocidade."""
         speed = value / 10.0
         self.speed_label.setText(f"{speed:.1f}x")
-    
+
     def _load_settings(self) -> None:
-        """Carrega as configurações nos widgets."""
+        """Carrega as configurações nas tabs já construídas."""
+        # Bloqueia os sinais durante a carga: cada setter dispararia os
+        # slots conectados (cascata de stateChanged/valueChanged)
+        blockers = [QSignalBlocker(w) for w in (
+            self.start_minimized_check, self.minimize_to_tray_check,
+            self.start_with_windows_check, self.panic_key_edit,
+        )]
+        
         self.start_minimized_check.setChecked(
             self._settings.get("start_minimized", False)
         )
@@ -223,14 +320,25 @@ class SettingsDialog(QDialog):
         self.panic_key_edit.setText(
             self._settings.get("panic_key", "escape")
         )
-        self.default_record_movement.setChecked(
-            self._settings.get("default_record_movement", False)
-        )
-        self.default_record_release.setChecked(
-            self._settings.get("default_record_release", True)
-        )
         
-        # Configurações de movimento suave
+        del blockers
+
+        # As demais tabs carregam seus valores ao serem construídas
+        if 1 in self._built:
+            self._load_movement_tab()
+        if 2 in self._built:
+            self._load_recording_tab()
+        if 3 in self._built:
+            self._load_data_tab()
+
+    def _load_movement_tab(self) -> None:
+        """Carrega as configurações de movimento suave nos widgets."""
+        blockers = [QSignalBlocker(w) for w in (
+            self.smooth_enabled_check, self.easing_combo,
+            self.speed_slider, self.min_duration_spin,
+            self.max_duration_spin,
+        )]
+        
         self.smooth_enabled_check.setChecked(
             self._settings.get("smooth_mouse_enabled", True)
         )
@@ -247,66 +355,144 @@ class SettingsDialog(QDialog):
             self._settings.get("smooth_mouse_max_duration", 800)
         )
         
+        del blockers
+
+    def _load_recording_tab(self) -> None:
+        """Carrega as opções de gravação nos widgets."""
+        blockers = [QSignalBlocker(w) for w in (
+            self.default_record_movement, self.default_record_release,
+        )]
+        
+        self.default_record_movement.setChecked(
+            self._settings.get("default_record_movement", False)
+        )
+        self.default_record_release.setChecked(
+            self._settings.get("default_record_release", True)
+        )
+        
+        del blockers
+
+    def _load_data_tab(self) -> None:
+        """Carrega os dados da tab de gerenciamento."""
         from ..utils.helpers import get_data_dir
         self.data_location_label.setText(str(get_data_dir()))
-    
+
     def _get_settings(self) -> dict:
-        """Obtém as configurações dos widgets."""
-        return {
-            "start_minimized": self.start_minimized_check.isChecked(),
-            "minimize_to_tray": self.minimize_to_tray_check.isChecked(),
-            "start_with_windows": self.start_with_windows_check.isChecked(),
-            "panic_key": self.panic_key_edit.text(),
-            "default_record_movement": self.default_record_movement.isChecked(),
-            "default_record_release": self.default_record_release.isChecked(),
-            # Configurações de movimento suave
-            "smooth_mouse_enabled": self.smooth_enabled_check.isChecked(),
-            "smooth_mouse_easing_index": self.easing_combo.currentIndex(),
-            "smooth_mouse_speed": self.speed_slider.value() / 10.0,
-            "smooth_mouse_min_duration": self.min_duration_spin.value(),
-            "smooth_mouse_max_duration": self.max_duration_spin.value(),
+        """
+        Obtém as configurações dos widgets.
+
+        Tabs nunca visitadas não têm widgets: seus valores vêm do dict
+        original, inalterados.
+        """
+        # Getters Qt primeiro, em bloco reto (cada um cruza a fronteira
+        # do binding), e só depois a montagem do dict literal
+        start_minimized = self.start_minimized_check.isChecked()
+        minimize_to_tray = self.minimize_to_tray_check.isChecked()
+        start_with_windows = self.start_with_windows_check.isChecked()
+        panic_key = self.panic_key_edit.text()
+
+        settings = {
+            "start_minimized": start_minimized,
+            "minimize_to_tray": minimize_to_tray,
+            "start_with_windows": start_with_windows,
+            "panic_key": panic_key,
         }
-    
+
+        if 1 in self._built:
+            smooth_enabled = self.smooth_enabled_check.isChecked()
+            easing_index = self.easing_combo.currentIndex()
+            speed = self.speed_slider.value() / 10.0
+            min_duration = self.min_duration_spin.value()
+            max_duration = self.max_duration_spin.value()
+            settings.update({
+                "smooth_mouse_enabled": smooth_enabled,
+                "smooth_mouse_easing_index": easing_index,
+                "smooth_mouse_speed": speed,
+                "smooth_mouse_min_duration": min_duration,
+                "smooth_mouse_max_duration": max_duration,
+            })
+        else:
+            settings.update({
+                "smooth_mouse_enabled":
+                    self._settings.get("smooth_mouse_enabled", True),
+                "smooth_mouse_easing_index":
+                    self._settings.get("smooth_mouse_easing_index", 2),
+                "smooth_mouse_speed":
+                    self._settings.get("smooth_mouse_speed", 1.0),
+                "smooth_mouse_min_duration":
+                    self._settings.get("smooth_mouse_min_duration", 50),
+                "smooth_mouse_max_duration":
+                    self._settings.get("smooth_mouse_max_duration", 800),
+            })
+
+        if 2 in self._built:
+            record_movement = self.default_record_movement.isChecked()
+            record_release = self.default_record_release.isChecked()
+            settings.update({
+                "default_record_movement": record_movement,
+                "default_record_release": record_release,
+            })
+        else:
+            settings.update({
+                "default_record_movement":
+                    self._settings.get("default_record_movement", False),
+                "default_record_release":
+                    self._settings.get("default_record_release", True),
+            })
+
+        return settings
+
     def _apply_settings(self) -> None:
-        """Aplica as configurações."""
-        settings = self._get_settings()
-        self._settings = settings
-        self.settings_changed.emit(settings)
-    
+        """Aplica as configurações (emissão coalescida em 300 ms)."""
+        self._settings = self._get_settings()
+        self._emit_timer.start()
+
+    def _emit_settings(self) -> None:
+        """Emite o snapshot mais recente das configurações."""
+        self.settings_changed.emit(self._settings)
+
     def _save_and_close(self) -> None:
-        """Salva e fecha o diálogo."""
-        self._apply_settings()
+        """Salva e fecha o diálogo (emissão síncrona: OK nunca se perde)."""
+        self._emit_timer.stop()
+        self._settings = self._get_settings()
+        self._emit_settings()
         self.accept()
-    
+
     def _open_data_folder(self) -> None:
         """Abre a pasta de dados no explorador."""
         import os
         from ..utils.helpers import get_data_dir
         os.startfile(str(get_data_dir()))
-    
+
     def _export_all(self) -> None:
-        """Exporta todas as macros."""
+        """Exporta todas as macros (cópia em thread do pool)."""
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Exportar Macros",
             "macros_backup.json",
             "JSON Files (*.json)"
         )
-        
+
         if file_path:
-            # Será implementado pela janela principal
             from ..utils.helpers import get_macros_file
-            import shutil
-            try:
-                shutil.copy2(get_macros_file(), file_path)
-                QMessageBox.information(
-                    self, "Sucesso", "Macros exportadas com sucesso!"
-                )
-            except Exception as e:
-                QMessageBox.critical(
-                    self, "Erro", f"Falha ao exportar: {e}"
-                )
-    
+            
+            self.export_btn.setEnabled(False)
+            task = _ExportTask(str(get_macros_file()), file_path)
+            task.signals.finished.connect(self._on_export_done)
+            QThreadPool.globalInstance().start(task)
+
+    def _on_export_done(self, ok: bool, error: str) -> None:
+        """Resultado do export, de volta na thread da GUI."""
+        self.export_btn.setEnabled(True)
+        if ok:
+            QMessageBox.information(
+                self, "Sucesso", "Macros exportadas com sucesso!"
+            )
+        else:
+            QMessageBox.critical(
+                self, "Erro", f"Falha ao exportar: {error}"
+            )
+
     def _import_macros(self) -> None:
         """Importa macros de um arquivo."""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -315,7 +501,7 @@ class SettingsDialog(QDialog):
             "",
             "JSON Files (*.json)"
         )
-        
+
         if file_path:
             QMessageBox.information(
                 self, "Info",
@@ -1,6 +1,9 @@
 """
 Estilos e tema dark para o MacroWing.
 """
+import functools
+import re
+import string
 
 # Paleta de cores
 COLORS = {
@@ -23,371 +26,399 @@ COLORS = {
 }
 
 
-DARK_THEME = f"""
+# Template (não f-string): nada é interpolado no import do módulo; o
+# QSS só é renderizado quando alguém pede o tema
+_THEME_TEMPLATE = string.Template("""
 /* ========== Janela Principal ========== */
-QMainWindow, QDialog {{
-    background-color: {COLORS["background"]};
-    color: {COLORS["text"]};
-}}
+QMainWindow, QDialog {
+    background-color: $background;
+    color: $text;
+}
 
-QWidget {{
+QWidget {
     background-color: transparent;
-    color: {COLORS["text"]};
+    color: $text;
     font-family: "Segoe UI", Arial, sans-serif;
     font-size: 13px;
-}}
+}
 
 /* ========== Menus ========== */
-QMenuBar {{
-    background-color: {COLORS["surface"]};
-    color: {COLORS["text"]};
+QMenuBar {
+    background-color: $surface;
+    color: $text;
     padding: 4px;
-    border-bottom: 1px solid {COLORS["border"]};
-}}
+    border-bottom: 1px solid $border;
+}
 
-QMenuBar::item:selected {{
-    background-color: {COLORS["secondary"]};
+QMenuBar::item:selected {
+    background-color: $secondary;
     border-radius: 4px;
-}}
+}
 
-QMenu {{
-    background-color: {COLORS["surface"]};
-    color: {COLORS["text"]};
-    border: 1px solid {COLORS["border"]};
+QMenu {
+    background-color: $surface;
+    color: $text;
+    border: 1px solid $border;
     border-radius: 8px;
     padding: 4px;
-}}
+}
 
-QMenu::item {{
+QMenu::item {
     padding: 8px 24px;
     border-radius: 4px;
-}}
+}
 
-QMenu::item:selected {{
-    background-color: {COLORS["secondary"]};
-}}
+QMenu::item:selected {
+    background-color: $secondary;
+}
 
-QMenu::separator {{
+QMenu::separator {
     height: 1px;
-    background-color: {COLORS["border"]};
+    background-color: $border;
     margin: 4px 8px;
-}}
+}
 
 /* ========== Botões ========== */
-QPushButton {{
-    background-color: {COLORS["secondary"]};
-    color: {COLORS["text"]};
+QPushButton {
+    background-color: $secondary;
+    color: $text;
     border: none;
     border-radius: 8px;
     padding: 10px 20px;
     font-weight: bold;
     min-height: 20px;
-}}
+}
 
-QPushButton:hover {{
-    background-color: {COLORS["secondary_light"]};
-}}
+QPushButton:hover {
+    background-color: $secondary_light;
+}
 
-QPushButton:pressed {{
-    background-color: {COLORS["primary_dark"]};
-}}
+QPushButton:pressed {
+    background-color: $primary_dark;
+}
 
-QPushButton:disabled {{
-    background-color: {COLORS["surface"]};
-    color: {COLORS["text_muted"]};
-}}
+QPushButton:disabled {
+    background-color: $surface;
+    color: $text_muted;
+}
 
-QPushButton#primaryButton {{
-    background-color: {COLORS["primary"]};
-}}
+QPushButton#primaryButton {
+    background-color: $primary;
+}
 
-QPushButton#primaryButton:hover {{
-    background-color: {COLORS["primary_hover"]};
-}}
+QPushButton#primaryButton:hover {
+    background-color: $primary_hover;
+}
 
-QPushButton#dangerButton {{
-    background-color: {COLORS["error"]};
-}}
+QPushButton#dangerButton {
+    background-color: $error;
+}
 
-QPushButton#successButton {{
-    background-color: {COLORS["success"]};
-}}
+QPushButton#successButton {
+    background-color: $success;
+}
 
 /* ========== Inputs ========== */
-QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox {{
-    background-color: {COLORS["surface"]};
-    color: {COLORS["text"]};
-    border: 2px solid {COLORS["border"]};
+QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox {
+    background-color: $surface;
+    color: $text;
+    border: 2px solid $border;
     border-radius: 8px;
     padding: 10px 14px;
     min-height: 20px;
-}}
+}
 
-QLineEdit:focus, QSpinBox:focus, QDoubleSpinBox:focus, QComboBox:focus {{
-    border-color: {COLORS["primary"]};
-}}
+QLineEdit:focus, QSpinBox:focus, QDoubleSpinBox:focus, QComboBox:focus {
+    border-color: $primary;
+}
 
-QLineEdit:disabled, QSpinBox:disabled, QDoubleSpinBox:disabled {{
-    background-color: {COLORS["surface_light"]};
-    color: {COLORS["text_muted"]};
-}}
+QLineEdit:disabled, QSpinBox:disabled, QDoubleSpinBox:disabled {
+    background-color: $surface_light;
+    color: $text_muted;
+}
 
-QComboBox::drop-down {{
+QComboBox::drop-down {
     border: none;
     padding-right: 10px;
-}}
+}
 
-QComboBox::down-arrow {{
+QComboBox::down-arrow {
     image: none;
     border-left: 5px solid transparent;
     border-right: 5px solid transparent;
-    border-top: 6px solid {COLORS["text"]};
+    border-top: 6px solid $text;
     margin-right: 10px;
-}}
+}
 
-QComboBox QAbstractItemView {{
-    background-color: {COLORS["surface"]};
-    border: 1px solid {COLORS["border"]};
+QComboBox QAbstractItemView {
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 8px;
-    selection-background-color: {COLORS["secondary"]};
-}}
+    selection-background-color: $secondary;
+}
 
 /* ========== Listas e Tabelas ========== */
-QListWidget, QTableWidget, QTreeWidget {{
-    background-color: {COLORS["surface"]};
-    border: 1px solid {COLORS["border"]};
+QListWidget, QTableWidget, QTreeWidget {
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 8px;
     padding: 4px;
     outline: none;
-}}
+}
 
-QListWidget::item {{
+QListWidget::item {
     padding: 12px;
     border-radius: 6px;
     margin: 2px;
-}}
+}
 
-QListWidget::item:selected {{
-    background-color: {COLORS["secondary"]};
-    color: {COLORS["text"]};
-}}
+QListWidget::item:selected {
+    background-color: $secondary;
+    color: $text;
+}
 
-QListWidget::item:hover {{
-    background-color: {COLORS["surface_light"]};
-}}
+QListWidget::item:hover {
+    background-color: $surface_light;
+}
 
-QTableWidget {{
-    gridline-color: {COLORS["border"]};
-}}
+QTableWidget {
+    gridline-color: $border;
+}
 
-QHeaderView::section {{
-    background-color: {COLORS["surface"]};
-    color: {COLORS["text_secondary"]};
+QHeaderView::section {
+    background-color: $surface;
+    color: $text_secondary;
     padding: 10px;
     border: none;
-    border-bottom: 1px solid {COLORS["border"]};
+    border-bottom: 1px solid $border;
     font-weight: bold;
-}}
+}
 
 /* ========== ScrollBars ========== */
-QScrollBar:vertical {{
-    background-color: {COLORS["surface"]};
+QScrollBar:vertical {
+    background-color: $surface;
     width: 12px;
     border-radius: 6px;
     margin: 0;
-}}
+}
 
-QScrollBar::handle:vertical {{
-    background-color: {COLORS["secondary"]};
+QScrollBar::handle:vertical {
+    background-color: $secondary;
     border-radius: 6px;
     min-height: 30px;
-}}
+}
 
-QScrollBar::handle:vertical:hover {{
-    background-color: {COLORS["secondary_light"]};
-}}
+QScrollBar::handle:vertical:hover {
+    background-color: $secondary_light;
+}
 
-QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
     height: 0;
-}}
+}
 
-QScrollBar:horizontal {{
-    background-color: {COLORS["surface"]};
+QScrollBar:horizontal {
+    background-color: $surface;
     height: 12px;
     border-radius: 6px;
-}}
+}
 
-QScrollBar::handle:horizontal {{
-    background-color: {COLORS["secondary"]};
+QScrollBar::handle:horizontal {
+    background-color: $secondary;
     border-radius: 6px;
     min-width: 30px;
-}}
+}
 
 /* ========== Labels ========== */
-QLabel {{
-    color: {COLORS["text"]};
-}}
+QLabel {
+    color: $text;
+}
 
-QLabel#titleLabel {{
+QLabel#titleLabel {
     font-size: 24px;
     font-weight: bold;
-    color: {COLORS["text"]};
-}}
+    color: $text;
+}
 
-QLabel#subtitleLabel {{
+QLabel#subtitleLabel {
     font-size: 14px;
-    color: {COLORS["text_secondary"]};
-}}
+    color: $text_secondary;
+}
 
-QLabel#sectionLabel {{
+QLabel#sectionLabel {
     font-size: 16px;
     font-weight: bold;
-    color: {COLORS["text"]};
+    color: $text;
     padding: 8px 0;
-}}
+}
 
 /* ========== GroupBox ========== */
-QGroupBox {{
-    background-color: {COLORS["surface"]};
-    border: 1px solid {COLORS["border"]};
+QGroupBox {
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 12px;
     margin-top: 20px;
     padding-top: 10px;
     font-weight: bold;
-}}
+}
 
-QGroupBox::title {{
+QGroupBox::title {
     subcontrol-origin: margin;
     subcontrol-position: top left;
     left: 16px;
     padding: 0 8px;
-    color: {COLORS["text"]};
-}}
+    color: $text;
+}
 
 /* ========== TabWidget ========== */
-QTabWidget::pane {{
-    background-color: {COLORS["surface"]};
-    border: 1px solid {COLORS["border"]};
+QTabWidget::pane {
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 8px;
     padding: 8px;
-}}
+}
 
-QTabBar::tab {{
+QTabBar::tab {
     background-color: transparent;
-    color: {COLORS["text_secondary"]};
+    color: $text_secondary;
     padding: 12px 24px;
     margin-right: 4px;
     border-bottom: 3px solid transparent;
-}}
+}
 
-QTabBar::tab:selected {{
-    color: {COLORS["text"]};
-    border-bottom-color: {COLORS["primary"]};
-}}
+QTabBar::tab:selected {
+    color: $text;
+    border-bottom-color: $primary;
+}
 
-QTabBar::tab:hover:!selected {{
-    color: {COLORS["text"]};
-    background-color: {COLORS["surface_light"]};
-}}
+QTabBar::tab:hover:!selected {
+    color: $text;
+    background-color: $surface_light;
+}
 
 /* ========== Checkboxes e Radio ========== */
-QCheckBox, QRadioButton {{
-    color: {COLORS["text"]};
+QCheckBox, QRadioButton {
+    color: $text;
     spacing: 8px;
-}}
+}
 
-QCheckBox::indicator, QRadioButton::indicator {{
+QCheckBox::indicator, QRadioButton::indicator {
     width: 20px;
     height: 20px;
-    border: 2px solid {COLORS["border"]};
-    background-color: {COLORS["surface"]};
-}}
+    border: 2px solid $border;
+    background-color: $surface;
+}
 
-QCheckBox::indicator {{
+QCheckBox::indicator {
     border-radius: 4px;
-}}
+}
 
-QRadioButton::indicator {{
+QRadioButton::indicator {
     border-radius: 10px;
-}}
+}
 
-QCheckBox::indicator:checked, QRadioButton::indicator:checked {{
-    background-color: {COLORS["primary"]};
-    border-color: {COLORS["primary"]};
-}}
+QCheckBox::indicator:checked, QRadioButton::indicator:checked {
+    background-color: $primary;
+    border-color: $primary;
+}
 
 /* ========== Sliders ========== */
-QSlider::groove:horizontal {{
-    background-color: {COLORS["surface"]};
+QSlider::groove:horizontal {
+    background-color: $surface;
     height: 8px;
     border-radius: 4px;
-}}
+}
 
-QSlider::handle:horizontal {{
-    background-color: {COLORS["primary"]};
+QSlider::handle:horizontal {
+    background-color: $primary;
     width: 20px;
     height: 20px;
     margin: -6px 0;
     border-radius: 10px;
-}}
+}
 
-QSlider::handle:horizontal:hover {{
-    background-color: {COLORS["primary_hover"]};
-}}
+QSlider::handle:horizontal:hover {
+    background-color: $primary_hover;
+}
 
 /* ========== ProgressBar ========== */
-QProgressBar {{
-    background-color: {COLORS["surface"]};
+QProgressBar {
+    background-color: $surface;
     border: none;
     border-radius: 8px;
     height: 16px;
     text-align: center;
-    color: {COLORS["text"]};
-}}
+    color: $text;
+}
 
-QProgressBar::chunk {{
-    background-color: {COLORS["primary"]};
+QProgressBar::chunk {
+    background-color: $primary;
     border-radius: 8px;
-}}
+}
 
 /* ========== ToolTip ========== */
-QToolTip {{
-    background-color: {COLORS["surface"]};
-    color: {COLORS["text"]};
-    border: 1px solid {COLORS["border"]};
+QToolTip {
+    background-color: $surface;
+    color: $text;
+    border: 1px solid $border;
     border-radius: 6px;
     padding: 8px;
-}}
+}
 
 /* ========== StatusBar ========== */
-QStatusBar {{
-    background-color: {COLORS["surface"]};
-    border-top: 1px solid {COLORS["border"]};
+QStatusBar {
+    background-color: $surface;
+    border-top: 1px solid $border;
     padding: 4px;
-}}
+}
 
-QStatusBar::item {{
+QStatusBar::item {
     border: none;
-}}
+}
 
 /* ========== Splitter ========== */
-QSplitter::handle {{
-    background-color: {COLORS["border"]};
-}}
+QSplitter::handle {
+    background-color: $border;
+}
 
-QSplitter::handle:horizontal {{
+QSplitter::handle:horizontal {
     width: 2px;
-}}
+}
 
-QSplitter::handle:vertical {{
+QSplitter::handle:vertical {
     height: 2px;
-}}
+}
 
 /* ========== Frame ========== */
-QFrame#cardFrame {{
-    background-color: {COLORS["surface"]};
-    border: 1px solid {COLORS["border"]};
+QFrame#cardFrame {
+    background-color: $surface;
+    border: 1px solid $border;
     border-radius: 12px;
     padding: 16px;
-}}
-"""
+}
+""")
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_WS_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=4)
+def _render_theme(palette_items: tuple) -> str:
+    """Renderiza e minifica o QSS para uma paleta (cacheado)."""
+    qss = _THEME_TEMPLATE.safe_substitute(dict(palette_items))
+    # Comentários e espaço em branco fora: o parser de QSS do Qt é
+    # O(N) no tamanho do texto
+    qss = _COMMENT_RE.sub("", qss)
+    return _WS_RE.sub(" ", qss).strip()
+
+
+def get_theme(palette: dict | None = None) -> str:
+    """Retorna o QSS do tema para a paleta dada (padrão: COLORS)."""
+    return _render_theme(tuple(sorted((palette or COLORS).items())))
+
+
+def __getattr__(name: str) -> str:
+    # DARK_THEME continua importável como constante, mas só renderiza
+    # no primeiro acesso (PEP 562)
+    if name == "DARK_THEME":
+        return get_theme()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
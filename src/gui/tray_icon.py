@@ -1,15 +1,25 @@
 """
 Ícone na bandeja do sistema.
 """
+import functools
+
 from PyQt6.QtWidgets import QSystemTrayIcon, QMenu
 from PyQt6.QtGui import QIcon, QAction, QPixmap, QPainter, QColor
-from PyQt6.QtCore import pyqtSignal, QObject
+from PyQt6.QtCore import pyqtSignal, QObject, QTimer
 
 from ..core.macro import Macro
 
 
-def create_default_icon() -> QIcon:
-    """Cria um ícone padrão para a bandeja."""
+@functools.lru_cache(maxsize=8)
+def create_default_icon(color_hex: str = "#e94560",
+                        letter: str = "M") -> QIcon:
+    """
+    Cria (e cacheia) um ícone para a bandeja.
+
+    Rasterizar o glifo com antialiasing não é de graça; o cache garante
+    uma única pintura por variante (cor, letra) — útil se estados de
+    gravação/reprodução ganharem ícones próprios no futuro.
+    """
     pixmap = QPixmap(64, 64)
     pixmap.fill(QColor(0, 0, 0, 0))
     
@@ -17,17 +27,17 @@ def create_default_icon() -> QIcon:
     painter.setRenderHint(QPainter.RenderHint.Antialiasing)
     
     # Círculo de fundo
-    painter.setBrush(QColor("#e94560"))
-    painter.setPen(QColor("#e94560"))
+    painter.setBrush(QColor(color_hex))
+    painter.setPen(QColor(color_hex))
     painter.drawEllipse(4, 4, 56, 56)
     
-    # Letra M
+    # Letra central
     painter.setPen(QColor("#ffffff"))
     font = painter.font()
     font.setPixelSize(36)
     font.setBold(True)
     painter.setFont(font)
-    painter.drawText(pixmap.rect(), 0x0084, "M")  # AlignCenter
+    painter.drawText(pixmap.rect(), 0x0084, letter)  # AlignCenter
     
     painter.end()
     return QIcon(pixmap)
@@ -46,70 +56,142 @@ class TrayIcon(QObject):
         super().__init__(parent)
         
         self._tray = QSystemTrayIcon(parent)
-        self._tray.setIcon(create_default_icon())
         self._tray.setToolTip("MacroWing - Gerenciador de Macros")
         
         self._menu = QMenu()
         self._macro_actions: dict[str, QAction] = {}
         
-        self._setup_menu()
+        # Debounce do submenu: chamadas em rajada (import de muitas
+        # macros) colapsam em uma atualização
+        self._pending_macros: list[Macro] | None = None
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(100)
+        self._update_timer.timeout.connect(self._flush_macros_update)
+        
+        # Só as entradas estáticas agora; submenu de macros e afins
+        # entram na primeira abertura do menu (ou no primeiro update)
+        self._dynamic_built = False
+        self._icon_set = False
+        self._setup_static_menu()
+        self._menu.aboutToShow.connect(self._ensure_dynamic_menu)
         
         self._tray.setContextMenu(self._menu)
         self._tray.activated.connect(self._on_activated)
     
-    def _setup_menu(self) -> None:
-        """Configura o menu de contexto."""
+    def _setup_static_menu(self) -> None:
+        """Configura as entradas fixas do menu de contexto."""
         # Mostrar janela
+        # Conexão sinal-a-sinal: sem trampolim Python por clique
         show_action = self._menu.addAction("📋 Mostrar MacroWing")
-        show_action.triggered.connect(lambda: self.show_window_requested.emit())
+        show_action.triggered.connect(self.show_window_requested)
+        
+        # Sair (referência guardada: as entradas dinâmicas são
+        # inseridas antes dela)
+        self._quit_action = self._menu.addAction("❌ Sair")
+        self._quit_action.triggered.connect(self.quit_requested)
+    
+    def _ensure_dynamic_menu(self) -> None:
+        """Monta o submenu de macros e o "Parar Todas" na primeira vez."""
+        if self._dynamic_built:
+            return
+        self._dynamic_built = True
         
-        self._menu.addSeparator()
+        menu = self._menu
+        before = self._quit_action
         
-        # Submenu de macros (será populado depois)
-        self._macros_menu = self._menu.addMenu("🎮 Macros")
+        menu.insertSeparator(before)
         
-        self._menu.addSeparator()
+        # Submenu de macros (populado por update_macros)
+        self._macros_menu = QMenu("🎮 Macros", menu)
+        menu.insertMenu(before, self._macros_menu)
         
-        # Parar todas
-        stop_action = self._menu.addAction("⏹️ Parar Todas")
-        stop_action.triggered.connect(lambda: self.stop_all_requested.emit())
+        menu.insertSeparator(before)
         
-        self._menu.addSeparator()
+        # Parar todas
+        stop_action = QAction("⏹️ Parar Todas", menu)
+        stop_action.triggered.connect(self.stop_all_requested)
+        menu.insertAction(before, stop_action)
         
-        # Sair
-        quit_action = self._menu.addAction("❌ Sair")
-        quit_action.triggered.connect(lambda: self.quit_requested.emit())
+        menu.insertSeparator(before)
     
     def update_macros(self, macros: list[Macro]) -> None:
-        """Atualiza a lista de macros no menu."""
-        self._macros_menu.clear()
-        self._macro_actions.clear()
+        """Agenda a atualização do submenu (coalescida em 100 ms)."""
+        self._pending_macros = macros
+        self._update_timer.start()
+    
+    def _flush_macros_update(self) -> None:
+        """
+        Atualiza a lista de macros no menu.
+
+        Diff incremental por id: um toggle de uma macro só ajusta o
+        texto/estado da QAction dela, em vez de limpar e recriar o
+        submenu inteiro (flicker e churn O(N) por mudança).
+        """
+        macros = self._pending_macros
+        if macros is None:
+            return
+        self._pending_macros = None
+        
+        self._ensure_dynamic_menu()
+        menu = self._macros_menu
+        actions = self._macro_actions
         
         if not macros:
-            no_macros = self._macros_menu.addAction("(nenhuma macro)")
+            menu.clear()
+            actions.clear()
+            no_macros = menu.addAction("(nenhuma macro)")
             no_macros.setEnabled(False)
             return
         
+        if not actions:
+            # Saindo do estado vazio: descarta o placeholder
+            menu.clear()
+        
+        new_ids = [m.id for m in macros]
+        new_id_set = set(new_ids)
+        
+        # Remove as ações das macros que saíram
+        for macro_id in list(actions):
+            if macro_id not in new_id_set:
+                action = actions.pop(macro_id)
+                menu.removeAction(action)
+                action.deleteLater()
+        
+        # QMenu não reordena ações no lugar: se a ordem relativa mudou
+        # (ou entrou macro no meio), reconstrói do zero
+        kept = [i for i in new_ids if i in actions]
+        expected = kept + [i for i in new_ids if i not in actions]
+        if kept != list(actions) or expected != new_ids:
+            menu.clear()
+            actions.clear()
+        
         for macro in macros:
-            if macro.enabled:
-                status = "🟢"
-            else:
-                status = "🔴"
-            
+            status = "🟢" if macro.enabled else "🔴"
             hotkey_str = f" [{macro.hotkey}]" if macro.hotkey else ""
             action_text = f"{status} {macro.name}{hotkey_str}"
             
-            action = self._macros_menu.addAction(action_text)
-            action.setCheckable(True)
+            action = actions.get(macro.id)
+            if action is None:
+                action = menu.addAction(action_text)
+                action.setCheckable(True)
+                action.triggered.connect(
+                    functools.partial(self._on_macro_triggered, macro.id))
+                actions[macro.id] = action
+            elif action.text() != action_text:
+                action.setText(action_text)
             action.setChecked(macro.enabled)
-            action.triggered.connect(
-                lambda checked, m_id=macro.id: self.toggle_macro_requested.emit(m_id)
-            )
-            
-            self._macro_actions[macro.id] = action
+    
+    def _on_macro_triggered(self, macro_id: str, checked: bool = False) -> None:
+        """Repassa o clique de uma macro do submenu para o sinal."""
+        self.toggle_macro_requested.emit(macro_id)
     
     def show(self) -> None:
         """Mostra o ícone na bandeja."""
+        # Ícone só aqui: a rasterização é o maior custo do construtor
+        if not self._icon_set:
+            self._icon_set = True
+            self._tray.setIcon(create_default_icon())
         self._tray.show()
     
     def hide(self) -> None:
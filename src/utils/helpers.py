@@ -1,13 +1,36 @@
 """
 Funções utilitárias para o MacroWing.
 """
+import functools
 import os
+import re
 import sys
 from pathlib import Path
 
+# Nome canônico de cada alias de modificador (para format_hotkey) e o
+# conjunto completo de modificadores (para is_modifier_key) — montados
+# uma vez em vez de varrer tuplas/reconstruir o set a cada chamada
+_MOD_CANONICAL = {
+    'ctrl': 'Ctrl', 'control': 'Ctrl', 'ctrl_l': 'Ctrl', 'ctrl_r': 'Ctrl',
+    'alt': 'Alt', 'alt_l': 'Alt', 'alt_r': 'Alt',
+    'shift': 'Shift', 'shift_l': 'Shift', 'shift_r': 'Shift',
+    'win': 'Win', 'super': 'Win', 'cmd': 'Win',
+    'super_l': 'Win', 'super_r': 'Win',
+}
 
+_MODIFIERS = frozenset(_MOD_CANONICAL) | {'alt_gr', 'meta'}
+
+# Tokens de uma hotkey: tudo que não é separador ('+' ou espaço)
+_HOTKEY_TOKENS = re.compile(r'[^+\s]+')
+
+
+@functools.lru_cache(maxsize=1)
 def get_data_dir() -> Path:
-    """Retorna o diretório de dados da aplicação."""
+    """Retorna o diretório de dados da aplicação.
+
+    Memoizado: o mkdir (um syscall, mesmo com o diretório já existindo)
+    roda uma única vez por processo.
+    """
     if sys.platform == "win32":
         base = Path(os.environ.get("APPDATA", Path.home()))
     else:
@@ -18,35 +41,47 @@ def get_data_dir() -> Path:
     return data_dir
 
 
+@functools.lru_cache(maxsize=1)
 def get_macros_file() -> Path:
     """Retorna o caminho do arquivo de macros."""
     return get_data_dir() / "macros.json"
 
 
+@functools.lru_cache(maxsize=1)
 def get_settings_file() -> Path:
     """Retorna o caminho do arquivo de configurações."""
     return get_data_dir() / "settings.json"
 
 
+def reset_paths_cache() -> None:
+    """Descarta os caminhos memoizados (para testes)."""
+    get_data_dir.cache_clear()
+    get_macros_file.cache_clear()
+    get_settings_file.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def _format_hotkey_cached(keys: tuple[str, ...]) -> str:
+    """Formatação memoizada (as mesmas combinações repetem no redraw)."""
+    return '+'.join(
+        _MOD_CANONICAL.get(key.lower())
+        or (key.upper() if len(key) == 1 else key.capitalize())
+        for key in keys
+    )
+
+
 def format_hotkey(keys: list[str]) -> str:
     """
     Formata uma lista de teclas em uma string de hotkey.
     Ex: ['ctrl', 'shift', '1'] -> 'Ctrl+Shift+1'
     """
-    formatted = []
-    for key in keys:
-        key_lower = key.lower()
-        if key_lower in ('ctrl', 'control', 'ctrl_l', 'ctrl_r'):
-            formatted.append('Ctrl')
-        elif key_lower in ('alt', 'alt_l', 'alt_r'):
-            formatted.append('Alt')
-        elif key_lower in ('shift', 'shift_l', 'shift_r'):
-            formatted.append('Shift')
-        elif key_lower in ('win', 'super', 'cmd', 'super_l', 'super_r'):
-            formatted.append('Win')
-        else:
-            formatted.append(key.upper() if len(key) == 1 else key.capitalize())
-    return '+'.join(formatted)
+    return _format_hotkey_cached(tuple(keys))
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_hotkey_cached(hotkey_str: str) -> tuple[str, ...]:
+    """Parse memoizado (tupla imutável, compartilhável entre chamadas)."""
+    return tuple(t.lower() for t in _HOTKEY_TOKENS.findall(hotkey_str))
 
 
 def parse_hotkey(hotkey_str: str) -> list[str]:
@@ -56,66 +91,64 @@ def parse_hotkey(hotkey_str: str) -> list[str]:
     """
     if not hotkey_str:
         return []
-    
-    parts = hotkey_str.split('+')
-    result = []
-    for part in parts:
-        part_clean = part.strip().lower()
-        if part_clean:
-            result.append(part_clean)
-    return result
-
-
+    return list(_parse_hotkey_cached(hotkey_str))
+
+
+# Nomes amigáveis de teclas especiais (hoisted: key_to_display roda uma
+# vez por tecla exibida a cada redraw da lista)
+_DISPLAY_MAP = {
+    'space': 'Espaço',
+    'enter': 'Enter',
+    'return': 'Enter',
+    'tab': 'Tab',
+    'escape': 'Esc',
+    'esc': 'Esc',
+    'backspace': '⌫',
+    'delete': 'Del',
+    'up': '↑',
+    'down': '↓',
+    'left': '←',
+    'right': '→',
+    'home': 'Home',
+    'end': 'End',
+    'page_up': 'PgUp',
+    'page_down': 'PgDn',
+    'insert': 'Ins',
+    'caps_lock': 'CapsLock',
+    'num_lock': 'NumLock',
+    'scroll_lock': 'ScrLock',
+    'print_screen': 'PrtSc',
+    'pause': 'Pause',
+}
+
+
+@functools.lru_cache(maxsize=512)
 def key_to_display(key: str) -> str:
     """Converte uma tecla para exibição amigável."""
-    display_map = {
-        'space': 'Espaço',
-        'enter': 'Enter',
-        'return': 'Enter',
-        'tab': 'Tab',
-        'escape': 'Esc',
-        'esc': 'Esc',
-        'backspace': '⌫',
-        'delete': 'Del',
-        'up': '↑',
-        'down': '↓',
-        'left': '←',
-        'right': '→',
-        'home': 'Home',
-        'end': 'End',
-        'page_up': 'PgUp',
-        'page_down': 'PgDn',
-        'insert': 'Ins',
-        'caps_lock': 'CapsLock',
-        'num_lock': 'NumLock',
-        'scroll_lock': 'ScrLock',
-        'print_screen': 'PrtSc',
-        'pause': 'Pause',
-    }
+    # String vazia (hotkey com separador sobrando) sai como entrou
+    if not key:
+        return key
+    if len(key) == 1:
+        return key.upper()
     
     key_lower = key.lower()
-    if key_lower in display_map:
-        return display_map[key_lower]
-    elif key_lower.startswith('f') and key_lower[1:].isdigit():
-        return key.upper()
-    elif len(key) == 1:
+    display = _DISPLAY_MAP.get(key_lower)
+    if display is not None:
+        return display
+    if key_lower[0] == 'f' and key_lower[1:].isdigit():
         return key.upper()
     return key.capitalize()
 
 
 def is_modifier_key(key: str) -> bool:
     """Verifica se a tecla é um modificador."""
-    modifiers = {
-        'ctrl', 'control', 'ctrl_l', 'ctrl_r',
-        'alt', 'alt_l', 'alt_r', 'alt_gr',
-        'shift', 'shift_l', 'shift_r',
-        'win', 'super', 'cmd', 'super_l', 'super_r', 'meta'
-    }
-    return key.lower() in modifiers
+    return key.lower() in _MODIFIERS
 
 
+@functools.lru_cache(maxsize=1024)
 def ms_to_display(ms: float) -> str:
-    """Converte milissegundos para exibição amigável."""
+    """Converte milissegundos para exibição amigável (memoizado: os
+    mesmos delays se repetem milhares de vezes por redraw)."""
     if ms < 1000:
         return f"{int(ms)}ms"
     elif ms < 60000:
@@ -0,0 +1,49 @@
+"""
+Serialização JSON com orjson quando disponível.
+
+Macros grandes chegam a milhares de ações; o encoder em C do orjson é
+uma ordem de grandeza mais rápido que o json da stdlib para esses
+payloads. Quando o orjson não está instalado, cai no json padrão com a
+mesma formatação (indentação de 2 espaços, UTF-8 sem escapes).
+"""
+import json
+import os
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data) -> bytes:
+    """Serializa para bytes UTF-8 indentados."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def loads(raw: bytes | str):
+    """Desserializa bytes/str JSON."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dump_file(data, file_path: Path) -> None:
+    """
+    Serializa e grava em um arquivo, de forma atômica.
+
+    Escreve em um .tmp ao lado e troca com os.replace: o arquivo final
+    nunca fica meio-escrito, mesmo se o processo cair no meio do save.
+    """
+    tmp_path = file_path.with_suffix(file_path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(data))
+    os.replace(tmp_path, file_path)
+
+
+def load_file(file_path: Path):
+    """Lê e desserializa um arquivo JSON."""
+    with open(file_path, 'rb') as f:
+        return loads(f.read())
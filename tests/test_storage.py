@@ -0,0 +1,73 @@
+"""
+Testes de round-trip da importação de macros.
+
+Rodar a partir da raiz do repositório:
+
+    python -m unittest discover tests
+"""
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.core import storage as storage_mod
+from src.core.macro import Macro, MacroAction, ActionType
+from src.core.storage import MacroStorage
+
+
+def _make_macro() -> Macro:
+    """Macro com floats em todos os campos numéricos fracionários."""
+    return Macro(
+        name="Importada",
+        hotkey="ctrl+1",
+        loop_delay=12.5,
+        actions=[
+            MacroAction(ActionType.MOUSE_MOVE, x=10, y=20,
+                        delay_before=16.7),
+            MacroAction(ActionType.MOUSE_SCROLL, dx=0, dy=-1,
+                        delay_before=8.3),
+            MacroAction(ActionType.DELAY, ms=250.0),
+        ],
+    )
+
+
+class ImportRoundTripTest(unittest.TestCase):
+    """Uma macro importada precisa sobreviver ao save seguinte."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.data_dir = Path(self._tmp.name)
+
+    def _round_trip(self, import_fn) -> list[Macro]:
+        """Exporta, importa com import_fn, salva e relê do disco."""
+        macro = _make_macro()
+        export_path = self.data_dir / "export.json"
+
+        storage = MacroStorage(self.data_dir / "macros.json")
+        storage.export_all([macro], export_path)
+
+        imported = import_fn(storage, export_path)
+        storage.save_all(imported)
+        storage.flush()
+
+        reloaded = MacroStorage(self.data_dir / "macros.json").load_all()
+        self.assertEqual(reloaded, [macro])
+        return imported
+
+    def test_import_survives_save(self):
+        """Caminho público (streaming com ijson, fallback sem)."""
+        self._round_trip(lambda s, p: s.import_macros(p))
+
+    @unittest.skipUnless(storage_mod.ijson is not None,
+                         "ijson não instalado")
+    def test_streaming_import_yields_floats(self):
+        """O parser streaming não pode materializar Decimal."""
+        imported = self._round_trip(
+            lambda s, p: s._import_macros_streaming(p))
+        action = imported[0].actions[0]
+        self.assertIsInstance(action.delay_before, float)
+        self.assertIsInstance(imported[0].loop_delay, float)
+
+
+if __name__ == "__main__":
+    unittest.main()